@@ -0,0 +1,116 @@
+'''
+Artifact: Pic-a-Pass bench_breach.py
+Description: Benchmark of the breach scan pipeline against the local fake range API
+Author(s): Team
+Precondition(s): Run from anywhere, e.g. python3 bench/bench_breach.py 100 1000 10000
+Postcondition(s): Prints a table of throughput, lookup latency percentiles and request counts per vault size
+Error(s): None
+Side effect(s): Starts a local server, the range cache is written to a temporary directory
+Invariant(s): Never contacts the real Pwned Passwords API
+Known fault(s): The server runs in the same process, its work shares the GIL and adds to the measured latency
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+#########################################################################################
+'''
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")) # App modules live in src
+from Breach import APIChecker
+from breachengine import BreachEngine
+from rangecache import RangeCache
+from fake_pwned_server import FakePwnedServer
+
+LATENCY = 0.03 # Seconds per response, roughly a round trip to the real API
+ERROR_RATE = 0.01 # Fraction of 503s, exercises the retry path
+WORKERS = 8
+REUSE = 0.2 # Fraction of entries that reuse another entry's password
+
+# Fake vault passwords, some reused. The server reports the first one as breached
+def make_passwords(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    passwords = []
+    for i in range(n):
+        if passwords and rng.random() < REUSE:
+            passwords.append(rng.choice(passwords))
+        else:
+            passwords.append(f"bench-password-{seed}-{i}")
+    return passwords
+
+# Wraps a checker to time every prefix lookup
+class TimedChecker:
+    def __init__(self, checker):
+        self.checker = checker
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def lookup_prefix(self, hash_prefix, suffixes):
+        start = time.perf_counter()
+        try:
+            return self.checker.lookup_prefix(hash_prefix, suffixes)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.latencies.append(elapsed)
+
+    def fit_cache(self, prefixes):
+        self.checker.fit_cache(prefixes)
+
+# Value at fraction p of a sorted list
+def percentile(values: list, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+# One full scan
+# @ret: Row of the results table
+def run_scan(label: str, server, checker, passwords: list) -> list:
+    server.reset_stats()
+    timed = TimedChecker(checker)
+    engine = BreachEngine(timed, WORKERS)
+    errors = 0
+    start = time.perf_counter()
+    for _, _, error in engine.check(passwords):
+        errors += error is not None
+    elapsed = time.perf_counter() - start
+    latencies = timed.latencies
+    return [label, f"{len(passwords) / elapsed:,.0f}/s", f"{elapsed:.2f}s", len(latencies),
+            f"{percentile(latencies, 0.5) * 1000:.1f}", f"{percentile(latencies, 0.95) * 1000:.1f}", f"{percentile(latencies, 0.99) * 1000:.1f}",
+            server.stats["requests"], server.stats["errors"] + server.stats["rate_limited"], errors]
+
+def bench(n: int) -> None:
+    passwords = make_passwords(n)
+    server = FakePwnedServer(latency=LATENCY, error_rate=ERROR_RATE, passwords={passwords[0]: 42}).start()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            checker = APIChecker(server.url, max_connections=WORKERS, rate=0, backoff=0.05)
+            cache = RangeCache(os.path.join(tmp, "range-cache"))
+            cached_checker = APIChecker(server.url, max_connections=WORKERS, rate=0, backoff=0.05, cache=cache)
+            rows = [
+                run_scan("no cache", server, checker, passwords),
+                run_scan("cold cache", server, cached_checker, passwords),
+                run_scan("warm cache", server, cached_checker, passwords),
+            ]
+            cache.ttl = 0 # Everything stale, revalidated with If-None-Match
+            rows.append(run_scan("revalidate", server, cached_checker, passwords))
+    finally:
+        server.stop()
+
+    # The engine grows the cache to fit every range of the scan (up to RANGE_CACHE_CEILING), so a warm scan makes no requests
+    print(f"\n{n} entries ({len(set(passwords))} distinct passwords, {LATENCY * 1000:.0f}ms latency, {ERROR_RATE:.0%} errors, {WORKERS} workers, {cache.max_bytes // (1024 * 1024)}MB cache)")
+    print(f"{'scan':<12}{'entries':>12}{'total':>9}{'lookups':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'requests':>10}{'retried':>9}{'failed':>8}")
+    for row in rows:
+        print(f"{row[0]:<12}{row[1]:>12}{row[2]:>9}{row[3]:>9}{row[4]:>9}{row[5]:>9}{row[6]:>9}{row[7]:>10}{row[8]:>9}{row[9]:>8}")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    for size in sizes:
+        bench(size)
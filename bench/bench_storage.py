@@ -0,0 +1,86 @@
+'''
+Artifact: Pic-a-Pass bench_storage.py
+Description: Benchmark comparing the vault storage backends (csv, journal, sqlite)
+Author(s): Team
+Precondition(s): Run from anywhere, e.g. python3 bench/bench_storage.py 1000 100000 1000000
+Postcondition(s): Prints a timing table. All files are created in a temporary directory
+Error(s): None
+Side effect(s): Uses a lot of disk and memory at 1M rows
+Invariant(s): None
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Time each backend's own newest first read                 |
+#########################################################################################
+'''
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")) # App modules live in src
+from vaultstorage import CSVStorage, JournalStorage, SQLiteStorage, new_record_id, migrate_csv_to_sqlite
+
+# Write a passwords.csv file with n fake rows. The ciphertext is random base64-sized text, nothing is decrypted
+def make_csv(path: str, n: int) -> None:
+    now = time.time()
+    with open(path, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        for i in range(n):
+            writer.writerow([f"site{i:07d}.com", f"user{i}", "A" * 40, "", now - i * 37 % 100000, "B" * 16])
+
+# Time a function call
+# @ret: (seconds, result)
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+# Read every row newest first the way each backend can: the file backends read the whole file and sort it in
+# memory, SQLite sorts in its own query
+# @ret: (record id, row) pairs, newest first
+def read_newest(name: str, storage) -> list:
+    if name == "sqlite":
+        db = sqlite3.connect(storage.PATH)
+        try:
+            query = "SELECT id, website, username, password, notes, timestamp, nonce FROM records ORDER BY timestamp DESC"
+            return [(row[0], list(row[1:])) for row in db.execute(query)]
+        finally:
+            db.close()
+    return sorted(storage.load(), key=lambda item: float(item[1][4]), reverse=True)
+
+def bench(n: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "passwords.csv")
+        make_csv(csv_path, n)
+
+        t_migrate, _ = timed(migrate_csv_to_sqlite, csv_path, os.path.join(tmp, "passwords.db"))
+        backends = {
+            "csv": CSVStorage(csv_path),
+            "journal": JournalStorage(os.path.join(tmp, "passwords.log"), csv_path),
+            "sqlite": SQLiteStorage(os.path.join(tmp, "passwords.db"), csv_path),
+        }
+        print(f"\n{n} rows (csv -> sqlite migration {t_migrate:.3f}s)")
+        print(f"{'backend':<10}{'load':>10}{'insert':>10}{'edit':>10}{'newest':>10}")
+        for name, storage in backends.items():
+            if name == "journal":
+                timed(storage.load) # First load imports passwords.csv, time the replay instead
+                storage.close()
+            t_load, rows = timed(storage.load)
+            t_insert, _ = timed(storage.put, new_record_id(), ["new.com", "new", "A" * 40, "", time.time(), "B" * 16])
+            record_id, row = rows[len(rows) // 2]
+            t_edit, _ = timed(storage.put, record_id, [row[0], "edited", "C" * 40, "", time.time(), "D" * 16])
+            storage.close()
+            t_newest, _ = timed(read_newest, name, storage)
+            storage.close()
+            print(f"{name:<10}{t_load:>10.3f}{t_insert:>10.4f}{t_edit:>10.4f}{t_newest:>10.3f}")
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000]
+    for size in sizes:
+        bench(size)
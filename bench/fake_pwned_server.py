@@ -0,0 +1,162 @@
+'''
+Artifact: Pic-a-Pass fake_pwned_server.py
+Description: Local stand-in for the Pwned Passwords range API, for load testing the breach checker offline
+Author(s): Team
+Precondition(s): Run from anywhere, e.g. python3 bench/fake_pwned_server.py --port 8787 --latency 0.05 --error-rate 0.01
+Postcondition(s): Serves GET /range/{prefix} until stopped
+Error(s): None
+Side effect(s): Listens on a local port
+Invariant(s): The same prefix always returns the same body, so results are repeatable
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+#########################################################################################
+'''
+import argparse
+import hashlib
+import random
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Serves synthetic range responses in the same format as api.pwnedpasswords.com/range/
+class FakePwnedServer:
+    def __init__(self, port: int = 0, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, suffixes: int = 800, passwords: dict = None, seed: int = 0):
+        '''
+        port: Port to listen on, 0 picks a free one
+        latency: Seconds every response is delayed by
+        jitter: Extra random delay of up to this many seconds
+        error_rate: Fraction of requests answered with a 503
+        rate_limit: Requests per second before answering 429 with Retry-After (0 disables the limit)
+        suffixes: Synthetic hashes per prefix, the real API returns around 800
+        passwords: Dictionary of password -> count that are always in their range
+        seed: Seed for the synthetic hashes and the errors
+        '''
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.suffixes = suffixes
+        self.seed = seed
+        self.known = {} # Prefix -> {suffix: count} of the given passwords
+        for password, count in (passwords or {}).items():
+            sha1 = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+            self.known.setdefault(sha1[:5], {})[sha1[5:]] = count
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "rate_limited": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic() # Start of the current one second rate limit window
+        self._window_count = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self.__handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/range/"
+
+    # Serve on a background thread
+    def start(self) -> "FakePwnedServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    # Body of a range response, generated from the prefix so it never changes
+    def range_body(self, prefix: str) -> str:
+        rng = random.Random(f"{self.seed}:{prefix}")
+        entries = {f"{rng.getrandbits(140):035X}": rng.randint(1, 100000) for _ in range(self.suffixes)}
+        entries.update(self.known.get(prefix, {}))
+        return "\r\n".join(f"{suffix}:{count}" for suffix, count in sorted(entries.items()))
+
+    # What to do with the next request: "ok", "error" or "rate_limited"
+    def _admit(self) -> str:
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.rate_limit > 0:
+                now = time.monotonic()
+                if now - self._window_start >= 1.0:
+                    self._window_start, self._window_count = now, 0
+                self._window_count += 1
+                if self._window_count > self.rate_limit:
+                    self.stats["rate_limited"] += 1
+                    return "rate_limited"
+            if self._rng.random() < self.error_rate:
+                self.stats["errors"] += 1
+                return "error"
+            return "ok"
+
+    def __handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1" # Keep-alive, like the real API
+            disable_nagle_algorithm = True # Headers and body are separate writes, Nagle would hold the body back ~40ms
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parts = self.path.split("/")
+                prefix = parts[-1].upper()
+                if len(parts) < 3 or parts[-2] != "range" or len(prefix) != 5 or any(c not in "0123456789ABCDEF" for c in prefix):
+                    self.__send(400, b"The hash prefix was not in a valid format")
+                    return
+                if server.latency or server.jitter:
+                    time.sleep(server.latency + random.random() * server.jitter)
+                outcome = server._admit()
+                if outcome == "rate_limited":
+                    self.__send(429, b"Rate limit exceeded", {"Retry-After": "1"})
+                    return
+                if outcome == "error":
+                    self.__send(503, b"Service unavailable")
+                    return
+                body = server.range_body(prefix).encode('utf-8')
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    with server._lock:
+                        server.stats["not_modified"] += 1
+                    self.__send(304, b"", {"ETag": etag})
+                    return
+                with server._lock:
+                    server.stats["ok"] += 1
+                self.__send(200, body, {"ETag": etag, "Content-Type": "text/plain"})
+
+            def __send(self, status: int, body: bytes, headers: dict = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Pwned Passwords range API")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many extra random seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests per second before 429s, 0 for none")
+    parser.add_argument("--suffixes", type=int, default=800, help="synthetic hashes per prefix")
+    args = parser.parse_args()
+    server = FakePwnedServer(args.port, args.latency, args.jitter, args.error_rate, args.rate_limit, args.suffixes).start()
+    print(f"Serving {server.url}{{prefix}}, ctrl+c to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -17,22 +17,24 @@ Known fault(s): None
 | Jesse DeBok  | 11/10/24   | Added password generation                                 |
 | Jesse DeBok  | 11/24/24   | Added checking password strength functionality            |
 | Jesse DeBok  | 12/8/24    | Added final comments to the document and color changes    |
+| Team         | 10/18/26   | Save through the shared vault repository                  |
+| Team         | 10/18/26   | Score strength once per change through the cached service |
+| Team         | 10/18/26   | Incremental strength while typing                         |
 #########################################################################################
 '''
 import sys
-import csv
-import time
 from generatepassword import PasswordGenerator
 from cryptoutils import PasswordCipher
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QFormLayout, QLineEdit, QPushButton, QMessageBox, QLabel
-from password_strength import p_strength #password strength function
+from strengthestimator import StrengthEstimator #strength of the text typed so far
 
 class AddPasswordProfile(QWidget):
-    def __init__(self, super_window, super_object, hash, cipher):
+    def __init__(self, super_window, super_object, hash, cipher, vault):
         super().__init__()
         self.hash = hash #from sign in page
         self.cipher = cipher #from sign in page
+        self.vault = vault #shared vault repository
         self.initUI( super_window, super_object ) #use super objects to proper refresh searchable button list
 
     def initUI( self, super_window, super_object ):
@@ -55,6 +57,7 @@ class AddPasswordProfile(QWidget):
         self.strength_label = QLabel( "Password strength: Waiting..." )
         self.strength_label.setFont(QFont("Arial", 14))
         form_layout.addWidget( self.strength_label )
+        self.estimator = StrengthEstimator() #only looks at new characters as they are typed
         self.input3.textChanged.connect(self.check_password_strength)
         form_layout.addRow("Notes:", self.input4)
         #timetamp is automatic
@@ -74,26 +77,14 @@ class AddPasswordProfile(QWidget):
         self.setLayout(layout)
 
     def save_to_csv(self):
-        # Get values from input fields
-        auth_data = self.input2.text().encode('utf-8') #encode as utf
-        ciphertext, nonce = self.cipher.encrypt(self.input3.text(), auth_data) #encrypt for storing
-        data = [
-            self.input1.text(),
-            self.input2.text(),
-            ciphertext.decode('utf-8'),
-            self.input4.text(),
-            time.time(),
-            nonce.decode('utf-8')
-        ] #data to store in csv file
-        
-        # Open file dialog to choose where to save the CSV
-        file_path = "passwords.csv"
-        
-        # Save data to CSV file
+        # Save data through the vault, which encrypts it and appends it to the journal
         try:
-            with open(file_path, mode="a", newline="") as file:
-                writer = csv.writer(file)
-                writer.writerow(data)
+            self.vault.insert(
+                self.input1.text(),
+                self.input2.text(),
+                self.input3.text(),
+                self.input4.text()
+            ) #timestamp and nonce are filled in by the vault
             #QMessageBox.information(self, "Success", "Data saved to CSV file successfully!")
             #Don't bring up success box
             # Clear the input fields
@@ -108,14 +99,17 @@ class AddPasswordProfile(QWidget):
         pw = PasswordGenerator() #use generate password function
         self.input3.setText( pw.generate_password() )
     def check_password_strength( self ):
-        if self.input3.text() == "":
+        password = self.input3.text()
+        self.estimator.update( password )
+        if password == "":
             #do nothing, prevents crashing
-            a = 1
-        elif p_strength( self.input3.text() ) == 0:
+            return
+        strength = self.estimator.strength()
+        if strength == 0:
             #weak
             self.strength_label.setText("Password strength: Weak")
             self.strength_label.setStyleSheet("color: red;")
-        elif p_strength( self.input3.text() ) == 1:
+        elif strength == 1:
             self.strength_label.setText("Password strength: Medium")
             self.strength_label.setStyleSheet("color: orange;")
         else:
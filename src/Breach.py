@@ -5,7 +5,7 @@ Author(s): Caden
 Precondition(s): Main Window has been created to display in tab.
 Postcondition(s): None
 Error(s):
-- Connection error: if the page cannot access the internet there is a connection error
+- Connection error: if the page cannot access the internet there is a connection error (use the offline corpus instead)
 Side effect(s): None
 Invariant(s): None
 Known fault(s): None
@@ -16,36 +16,127 @@ Known fault(s): None
 | Caden        | 11/10/24   | Creation                                                  |
 | Team         | 11/24/24   | Visuals                                                   |
 | Team         | 12/08/24   | Bug Fixes                                                 |
+| Team         | 10/18/26   | Read records from the shared vault repository             |
+| Team         | 10/18/26   | Bulk decryption of the vault before checking              |
+| Team         | 10/18/26   | Offline checking against a local corpus                   |
+| Team         | 10/18/26   | Concurrent checking with a pooled session and retries     |
+| Team         | 10/18/26   | One range request per distinct hash prefix                |
+| Team         | 10/18/26   | On-disk cache of range responses                          |
+| Team         | 10/18/26   | Incremental scans, only changed or expired entries        |
+| Team         | 10/18/26   | Progress, pause, cancel and checkpoints                   |
+| Team         | 10/18/26   | Results table filled in batches                           |
+| Team         | 10/18/26   | Scheduled background checks                               |
+| Team         | 10/18/26   | Vault health report                                       |
+| Team         | 10/18/26   | Range cache sized to each scan                            |
+| Team         | 10/18/26   | Start a scan without waiting on the background check      |
+| Team         | 10/18/26   | Vault health audit on a worker thread                     |
+| Team         | 10/18/26   | Own scan finished signal, no longer hides QThread's       |
 #########################################################################################
 '''
 import hashlib
 import requests
-import csv
-from PyQt5.QtWidgets import (QWidget, QFormLayout, QLabel, 
-                          QVBoxLayout, QScrollArea, QPushButton)
+import requests.adapters
+import time
+from PyQt5.QtWidgets import (QWidget, QLabel, QApplication, QHBoxLayout, QLineEdit, QTableView,
+                          QVBoxLayout, QAbstractItemView, QPushButton, QCheckBox, QProgressBar, QMessageBox)
 from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from breachcorpus import OfflineChecker, OFFLINE_CORPUS
+from breachengine import BreachEngine, RateLimiter
+from rangecache import RangeCache
+from breachstate import BreachStateStore
+from BreachResultModel import BreachResult, BreachResultModel
+from BreachMonitor import BreachMonitor, MONITOR_WORKERS, MONITOR_TIMEOUT, MONITOR_RETRIES, MONITOR_MAX_WAIT
+from vaultaudit import audit_vault
 import os
 
 class APIChecker:
     # Initialize the checker with the api url
-    def __init__(self):
-        self.url = "https://api.pwnedpasswords.com/range/"
+    # url: Base url of the range api
+    # max_connections: Size of the keep-alive connection pool, should be at least the number of workers
+    # rate: Requests per second allowed across all threads (0 disables the limit)
+    # max_retries: Retries for 429 and 5xx responses and connection errors
+    # backoff: First retry wait in seconds, doubled on every retry
+    # cache: Optional RangeCache, fresh entries skip the request and stale ones are revalidated by ETag
+    # timeout: Seconds to wait for a response
+    # max_wait: Longest wait between retries in seconds, caps both Retry-After and the backoff (None for no cap)
+    def __init__(self, url: str = "https://api.pwnedpasswords.com/range/", max_connections: int = 8, rate: float = 50.0, max_retries: int = 4, backoff: float = 0.5, cache=None, timeout: float = 10, max_wait: float = None):
+        self.url = url
+        self.cache = cache
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_wait = max_wait
+        self.rate_limiter = RateLimiter(rate, burst=max_connections)
+        # One session for every lookup so connections are kept alive instead of a new TCP+TLS handshake each time
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
+    # Let the range cache hold this many prefixes, called by BreachEngine before a scan
+    def fit_cache(self, prefixes: int) -> None:
+        if self.cache is not None:
+            self.cache.fit(prefixes)
+
     # The API requires the first 5 characters of a sha1 hash
     def _get_sha1_hash(self, password: str) -> str:
         return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
 
-    # Query the have i been pwned api
+    # Query the have i been pwned api, or the cache when it has a fresh copy
     def _query_api(self, hash_prefix: str) -> str:
-        try:
-            # Perform a get request with the format: api_url/hash_prefix 
-            response = requests.get(f"{self.url}{hash_prefix}")
-            if response.status_code != 200:
-                raise ConnectionError(f"API returned status code {response.status_code}")
-            # Return the response
-            return response.text
-        except requests.RequestException as e:
-            raise ConnectionError(f"Failed to check password: {str(e)}")
+        cached = self.cache.load(hash_prefix) if self.cache is not None else None
+        headers = {}
+        if cached is not None:
+            body, etag, fetched_at = cached
+            if self.cache.is_fresh(fetched_at):
+                return body
+            if etag:
+                headers["If-None-Match"] = etag # Server answers 304 if the range hasn't changed
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire() # Wait for our turn so we don't get rate limited
+            try:
+                # Perform a get request with the format: api_url/hash_prefix 
+                response = self.session.get(f"{self.url}{hash_prefix}", headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    raise ConnectionError(f"Failed to check password: {str(e)}")
+                time.sleep(self._retry_wait(self.backoff * (2 ** attempt))) # Back off before trying again
+                continue
+            if response.status_code == 200:
+                # Keep a copy and return the response
+                if self.cache is not None:
+                    self.cache.store(hash_prefix, response.text, response.headers.get("ETag"))
+                return response.text
+            if response.status_code == 304 and cached is not None:
+                # Cached copy is still current, restart its time to live
+                self.cache.store(hash_prefix, body, etag)
+                return body
+            if (response.status_code == 429 or response.status_code >= 500) and attempt < self.max_retries:
+                # Too many requests or server trouble, wait as long as the server asks or back off
+                retry_after = response.headers.get("Retry-After", "")
+                time.sleep(self._retry_wait(float(retry_after) if retry_after.replace(".", "", 1).isdigit() else self.backoff * (2 ** attempt)))
+                continue
+            raise ConnectionError(f"API returned status code {response.status_code}")
+
+    # Seconds to wait before a retry, no more than max_wait
+    def _retry_wait(self, wait: float) -> float:
+        return wait if self.max_wait is None else min(wait, self.max_wait)
+
+    # Parse a range response into suffix -> breach count, once per response
+    def _parse_range(self, api_response: str) -> dict:
+        counts = {}
+        for line in api_response.splitlines():
+            suffix, count = line.split(':')
+            counts[suffix] = int(count)
+        return counts
+
+    # Check every hash that shares a prefix with a single range request
+    # hash_prefix: First 5 characters of the hashes
+    # suffixes: Remaining 35 characters of each hash to look up
+    # @ret: Dictionary of suffix -> number of data breaches (0 if not breached)
+    def lookup_prefix(self, hash_prefix: str, suffixes) -> dict:
+        counts = self._parse_range(self._query_api(hash_prefix))
+        return {suffix: counts.get(suffix, 0) for suffix in suffixes}
 
     # This will actually check the password
     def check_password(self, password: str) -> int:
@@ -54,80 +145,202 @@ class APIChecker:
         hash_prefix = password_hash[:5]
         hash_suffix = password_hash[5:]
 
-        # Get the api response, if not throw the error it gives
-        # Can potentially deal with and catch the error here I'm just not sure what we're doing yet
-        try:
-            api_response = self._query_api(hash_prefix)
-        except ConnectionError as e:
-            raise e
-
-        # Check if the suffix exists in the response
-        for line in api_response.splitlines():
-            suffix, count = line.split(':')
-            if suffix == hash_suffix:
-                # Return the number of data breaches
-                return int(count)
-
-        # Return false iff the suffix isnt in the response
-        return 0
+        # Get the api response and look for the suffix in it, if not throw the error it gives
+        return self.lookup_prefix(hash_prefix, [hash_suffix])[hash_suffix]
 
 # Class for the worker thread to check passwords async
 class PasswordCheckerThread(QThread):
-    result = pyqtSignal(str, str, int)  # Breach found signal
-    error = pyqtSignal(str) # Error signal
-    finished = pyqtSignal() # Finished signal
+    results = pyqtSignal(list) # Batch of BreachResults, breached entries and entries that failed to check
+    error = pyqtSignal(str) # Error signal for the scan as a whole
+    progress = pyqtSignal(int, int, float, float) # Entries done, total entries, seconds left (-1 if unknown), lookups per second
+    check_finished = pyqtSignal() # Sent from the worker thread as the scan ends, QThread's finished follows once it has stopped
+
+    PROGRESS_INTERVAL = 0.1 # Seconds between progress signals
+    CHECKPOINT_INTERVAL = 5.0 # Seconds between saves of the state, so an interrupted scan resumes from there
 
-    # Constructor that takes in the APIchecker, list of passwords, and the cipher
-    def __init__(self, checker, passwords, cipher):
+    # Constructor that takes in the APIchecker, list of password records, the vault, how many lookups to run at once,
+    # and optionally a BreachStateStore so entries that haven't changed since the last scan are skipped
+    def __init__(self, checker, passwords, vault, max_workers=8, state=None):
         super().__init__()
         self.checker = checker
         self.passwords = passwords
-        self.cipher = cipher
+        self.vault = vault
+        self.state = state
+        self.engine = BreachEngine(checker, max_workers)
+        self.done = 0 # Entries reported so far, reused or looked up
+        self._started = None # When lookups started
+        self._paused_at = None # When the current pause started
+        self._paused_for = 0.0 # Seconds spent paused, left out of the throughput
+        self._last_progress = 0.0
+        self._batch = [] # BreachResults not emitted yet, sent with the next progress signal
+        self._breached_before = set() # Ids of entries that were breached going into this scan
+
+    # Stop the scan. Results so far are kept and the next scan carries on from them
+    def cancel(self):
+        self.engine.cancel()
+
+    def pause(self):
+        if self._paused_at is None:
+            self._paused_at = time.monotonic()
+        self.engine.pause()
+
+    def resume(self):
+        if self._paused_at is not None:
+            self._paused_for += time.monotonic() - self._paused_at
+            self._paused_at = None
+        self.engine.resume()
+
+    def is_cancelled(self):
+        return self.engine.is_cancelled()
+
+    # Ids of entries breached after this scan that weren't breached before it. Needs a state store
+    def newly_breached(self):
+        if self.state is None:
+            return set()
+        return {record_id for record_id, last in self.state.entries.items() if last.count > 0} - self._breached_before
 
     # Run checks
     def run(self):
-        # This indicates some sort of error has happened when parsing csv
-        for i, row in enumerate(self.passwords):
-            try:
-                # Expect: website, username, password, notes, last_updated
-                if len(row) < 3:
-                    self.error.emit(f"Row {i+1} has insufficient data")
-                    continue
-                    
-                # Grab the website, username, and encrypted password
-                website = row[0]
-                username = row[1]
-                encrypted_password = row[2]
-
-                # Decrypt using the same pattern as password page
-                try:
-                    decrypted_password = self.cipher.decrypt(
-                        encrypted_password, 
-                        row[5], 
-                        username.encode('utf-8')
-                    )
-                except Exception as e:
-                    self.error.emit(f"Failed to decrypt password for {website}/{username}: {str(e)}")
-                    continue
-
-                # Get the number of breaches
-                num_breaches = self.checker.check_password(decrypted_password)
-
-                # If a breach has been found, emit the result signal
-                if num_breaches > 0:
-                    self.result.emit(website, username, num_breaches)
-            # If there was an error, emit the signal as an error
-            except ConnectionError as e:
-                self.error.emit(f"Error checking {website}/{username}: {str(e)}")
-            except Exception as e:
-                self.error.emit(f"Error processing row {i+1}: {str(e)}")
+        try:
+            if self.state is not None:
+                self.state.load()
+                self._breached_before = {record_id for record_id, last in self.state.entries.items() if last.count > 0}
+            stale = self.__reuse_results() # Entries whose last result can't be reused
+            # Decrypt the whole batch up front, the cipher spreads the work over its thread pool
+            secrets = self.vault.secrets(stale)
+        except Exception as e:
+            self.error.emit(f"Failed to decrypt passwords: {str(e)}")
+            self.check_finished.emit()
+            return
+
+        records, passwords, fingerprints = self.__changed_passwords(stale, secrets)
+        self._started = time.monotonic()
+        reused = self.done
+        last_checkpoint = self._started
+        self.__emit_progress(0, force=True) # Also sends the results of reused entries
+
+        # Lookups run concurrently, results come back here as they finish and are emitted from this thread
+        for i, num_breaches, error in self.engine.check(passwords):
+            record = records[i]
+            self.done += 1
+            if error is not None:
+                # If there was an error, report it in the results
+                self._batch.append(BreachResult(record.website, record.username, error=f"Error checking: {error}"))
+            else:
+                if self.state is not None:
+                    self.state.set(record.id, record.nonce, fingerprints[i], num_breaches)
+                self.__report(record, num_breaches)
+            self.__emit_progress(self.done - reused)
+            if self.state is not None and time.monotonic() - last_checkpoint >= self.CHECKPOINT_INTERVAL:
+                self.__save_state(prune=False)
+                last_checkpoint = time.monotonic()
+        self.__emit_progress(self.done - reused, force=True)
+
+        if self.state is not None:
+            self.__save_state(prune=not self.is_cancelled()) # A cancelled scan hasn't seen every entry
             
         # Emit the finished signal once finished checking
-        self.finished.emit()
+        self.check_finished.emit()
+
+    # Checkpoint the state. Pruning drops deleted entries, only done once every entry has been seen
+    def __save_state(self, prune: bool):
+        if prune:
+            self.state.prune(record.id for record in self.vault.all())
+        try:
+            self.state.save()
+        except OSError as e:
+            self.error.emit(f"Failed to save breach check state: {str(e)}")
+
+    # Emit progress and the results gathered since the last call, at most every PROGRESS_INTERVAL seconds
+    # looked_up: Entries finished by lookups this scan (not reused), used for the throughput
+    def __emit_progress(self, looked_up: int, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_progress < self.PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self.results.emit(batch)
+        elapsed = now - self._started - self._paused_for - (now - self._paused_at if self._paused_at is not None else 0)
+        rate = looked_up / elapsed if elapsed > 0 else 0.0
+        remaining = len(self.passwords) - self.done
+        eta = remaining / rate if rate > 0 else (0.0 if remaining == 0 else -1.0)
+        self.progress.emit(self.done, len(self.passwords), eta, rate)
+
+    def __report(self, record, num_breaches):
+        if num_breaches > 0:
+            # If a breach has been found, add it to the next batch of results
+            self._batch.append(BreachResult(record.website, record.username, num_breaches))
+
+    # Report every entry that hasn't been re-encrypted since a recent check, without decrypting it
+    # @ret: The records that still need their password looked at
+    def __reuse_results(self) -> list:
+        if self.state is None:
+            return list(self.passwords)
+        stale = []
+        for record in self.passwords:
+            last = self.state.get(record.id)
+            if self.state.is_fresh(last) and last.nonce == record.nonce:
+                self.done += 1
+                self.__report(record, last.count)
+            else:
+                stale.append(record)
+        return stale
+
+    # Report entries that were re-encrypted but still hold a recently checked password,
+    # including a password checked for a different entry
+    # @ret: (records, passwords, fingerprints) of the entries that have to be looked up
+    def __changed_passwords(self, stale, secrets) -> tuple:
+        if self.state is None:
+            return stale, secrets, [None] * len(stale)
+        known = {} # Fingerprint -> a fresh result for that password
+        for last in self.state.entries.values():
+            if self.state.is_fresh(last):
+                known[last.fingerprint] = last
+        records, passwords, fingerprints = [], [], []
+        for record, secret in zip(stale, secrets):
+            fingerprint = self.state.fingerprint(secret)
+            last = known.get(fingerprint)
+            if last is not None:
+                self.state.set(record.id, record.nonce, fingerprint, last.count, last.checked_at) # Keeps the old check time so it still expires
+                self.done += 1
+                self.__report(record, last.count)
+            else:
+                records.append(record)
+                passwords.append(secret)
+                fingerprints.append(fingerprint)
+        return records, passwords, fingerprints
+
+# Audits the vault off the window's thread, the pattern engine takes seconds on a large vault
+class HealthAuditThread(QThread):
+    report = pyqtSignal(object) # HealthReport once the audit is done
+    error = pyqtSignal(str) # Error signal for the audit
 
-def create_breach_page(main_window, cipher) -> QWidget:
-    # Initialize the API checker and the UI
-    checker = APIChecker()
+    def __init__(self, vault):
+        super().__init__()
+        self.vault = vault
+
+    # Stop the audit, no report is sent. Used when the app closes
+    def cancel(self):
+        self.requestInterruption()
+
+    def run(self):
+        try:
+            report = audit_vault(self.vault, stop=self.isInterruptionRequested)
+        except Exception as e:
+            self.error.emit(f"Error auditing passwords: {str(e)}")
+            return
+        if not self.isInterruptionRequested():
+            self.report.emit(report)
+
+def create_breach_page(main_window, cipher, vault, background: bool = True) -> QWidget:
+    # Initialize the API checker, the offline checker and the UI
+    range_cache = RangeCache()
+    checker = APIChecker(cache=range_cache)
+    # Slow and steady, leaves the network to the user. Short waits so a cancelled background check stops quickly
+    background_checker = APIChecker(max_connections=MONITOR_WORKERS, rate=2.0, max_retries=MONITOR_RETRIES, cache=range_cache, timeout=MONITOR_TIMEOUT, max_wait=MONITOR_MAX_WAIT)
+    state = BreachStateStore(cipher) # Results of earlier scans, so only changed entries are looked up again
+    offline_checker = OfflineChecker(OFFLINE_CORPUS) # Only opens the corpus when it is first used
     breach_page = QWidget(main_window)
     breach_page.setObjectName("breach")
     
@@ -135,13 +348,32 @@ def create_breach_page(main_window, cipher) -> QWidget:
     main_layout = QVBoxLayout()
     breach_page.setLayout(main_layout)
     
-    # Create scroll area for results
-    scroll = QScrollArea()
-    scroll.setWidgetResizable(True)
-    scroll_content = QWidget()
-    results_layout = QFormLayout()
-    scroll_content.setLayout(results_layout)
-    scroll.setWidget(scroll_content)
+    # Create the results table. Click a header to sort, most breached first by default
+    results_model = BreachResultModel(breach_page)
+    results_view = QTableView()
+    results_view.setModel(results_model)
+    results_view.setSortingEnabled(True)
+    results_view.sortByColumn(2, Qt.DescendingOrder)
+    results_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+    results_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+    results_view.verticalHeader().hide()
+    results_view.horizontalHeader().setStretchLastSection(True)
+    results_view.setStyleSheet("""
+        font-size: 16px;
+    """)
+
+    # Filter box for the results
+    filter_box = QLineEdit()
+    filter_box.setPlaceholderText("Filter results")
+    filter_box.textChanged.connect(results_model.set_filter)
+
+    # Messages about the scan as a whole (nothing to check, nothing found, errors)
+    message_label = QLabel("")
+    message_label.setWordWrap(True)
+    message_label.setStyleSheet("""
+        font-size: 16px;
+    """)
+    message_label.hide()
     
     # Add header label
     header = QLabel("Password Breach Check Results")
@@ -149,74 +381,112 @@ def create_breach_page(main_window, cipher) -> QWidget:
     header.setAlignment(Qt.AlignCenter)
     main_layout.addWidget(header)
     
-    # Add scroll area
-    main_layout.addWidget(scroll)
+    # Add filter, results table and messages
+    main_layout.addWidget(filter_box)
+    main_layout.addWidget(results_view)
+    main_layout.addWidget(message_label)
     
-    # Add check button
+    # Add offline mode checkbox, only usable once the Pwned Passwords dump has been downloaded
+    offline_box = QCheckBox("Check offline against the local Pwned Passwords corpus")
+    offline_box.setEnabled(os.path.exists(OFFLINE_CORPUS))
+    offline_box.setChecked(os.path.exists(OFFLINE_CORPUS))
+    main_layout.addWidget(offline_box)
+
+    # Add background checking checkbox
+    background_box = QCheckBox("Check for new breaches in the background")
+    background_box.setChecked(background)
+    main_layout.addWidget(background_box)
+
+    # Add progress bar and status, hidden until a scan starts
+    progress_bar = QProgressBar()
+    progress_bar.hide()
+    main_layout.addWidget(progress_bar)
+    status_label = QLabel("")
+    status_label.hide()
+    main_layout.addWidget(status_label)
+
+    # Add check, pause, cancel and health buttons
     check_button = QPushButton("Check Passwords")
-    main_layout.addWidget(check_button)
+    pause_button = QPushButton("Pause")
+    cancel_button = QPushButton("Cancel")
+    health_button = QPushButton("Vault Health")
+    pause_button.setEnabled(False)
+    cancel_button.setEnabled(False)
+    button_layout = QHBoxLayout()
+    button_layout.addWidget(check_button)
+    button_layout.addWidget(pause_button)
+    button_layout.addWidget(cancel_button)
+    button_layout.addWidget(health_button)
+    main_layout.addLayout(button_layout)
+    breach_page.thread = None
+    breach_page.health_thread = None # Audit running for the health report, if any
     
     # Function to start checking
     def start_check():
         # Clear previous results
-        for i in reversed(range(results_layout.rowCount())):
-            results_layout.removeRow(i)
+        results_model.clear()
+        message_label.hide()
             
         try:
-            # Try to read password file
-            if not os.path.exists('passwords.csv'):
-                error_label = QLabel("Error: passwords.csv not found!") # If the passwords file isnt there tell the user
-                error_label.setStyleSheet("""
-                    font-size: 16px;
-                """)
-                results_layout.addRow(error_label) # Add the error message to the screen
-                return
-                
-            with open('passwords.csv', 'r') as file: # Open the passwords file
-                passwords = list(csv.reader(file))
+            passwords = vault.all() # Records are already loaded by the shared vault
             
-            if not passwords: # If the passwords file doesnt exist,
-                results_layout.addRow(QLabel("No passwords found in file!")) # Tell the user the file cant be found
+            if not passwords: # If there are no saved passwords
+                show_message("No passwords found in file!") # Tell the user there is nothing to check
                 return
                 
-            # Disable button
+            # A background check would race this one for the saved state. Stop it and come back here once it
+            # has finished, the window stays responsive while its last lookups finish
+            if monitor.is_running():
+                check_button.setEnabled(False)
+                status_label.setText("Stopping the background check...")
+                status_label.show()
+                monitor.cancel(then=start_check)
+                return
+
+            # Disable button, enable the scan controls
             check_button.setEnabled(False)
+            pause_button.setText("Pause")
+            pause_button.setEnabled(True)
+            cancel_button.setEnabled(True)
+            progress_bar.setRange(0, len(passwords))
+            progress_bar.setValue(0)
+            progress_bar.show()
+            status_label.setText("Decrypting passwords...")
+            status_label.show()
             
             # Create and start worker thread
-            thread = PasswordCheckerThread(checker, passwords, cipher)
+            thread = PasswordCheckerThread(offline_checker if use_offline() else checker, passwords, vault, state=state)
             
-            # Function for the result of the worker thread
-            def on_result(website, username, num_breaches):
-                # Print the website and how many times that password has been breached
-                label = QLabel(f"Password for {website} ({username}) has been breached {num_breaches} times!")
-                label.setStyleSheet("""
-                    font-size: 16px;
-                """)
-                results_layout.addRow(label) # Add the result to the screen
-                
             # Function for error sent from worker thread
             def on_error(error_msg):
-                label = QLabel(error_msg) # Print the error message
-                label.setStyleSheet("""
-                    font-size: 16px;
-                """)
-                results_layout.addRow(label) # Add it to the screen
+                show_message(error_msg) # Print the error message
                 
-            # Function for when the worker thread is finished
+            # Function for progress sent from worker thread
+            def on_progress(done, total, eta, rate):
+                progress_bar.setValue(done)
+                time_left = "calculating" if eta < 0 else f"{int(eta // 60)}m {int(eta % 60)}s left"
+                status_label.setText(f"Checked {done} of {total} ({rate:.0f}/s, {time_left})")
+
+            # Function for when the worker thread has stopped
             def on_finished():
                 check_button.setEnabled(True) #Re enable the check passwords button
-                if results_layout.rowCount() == 0: #If no breaches were found
-                    label = QLabel("No breached passwords found!") # Tell the user no breaches were found
-                    label.setStyleSheet("""
-                        font-size: 16px;
-                    """)
-                    results_layout.addRow(label) # Add the message to the screen
+                pause_button.setEnabled(False)
+                cancel_button.setEnabled(False)
+                progress_bar.hide()
+                if thread.is_cancelled(): # Results so far are saved, the next scan picks up from there
+                    status_label.setText(f"Scan cancelled after {thread.done} of {len(passwords)}, checking again resumes it")
+                else:
+                    status_label.hide()
+                results_model.flush() # Show the last batch straight away
+                if results_model.total() == 0 and not thread.is_cancelled() and message_label.isHidden(): #If no breaches were found
+                    show_message("No breached passwords found!") # Tell the user no breaches were found
             
             breach_page.thread = thread
             
             # Connect the signal sent from the worker thread to the main one
-            thread.result.connect(on_result)
+            thread.results.connect(results_model.add_results) # Batches are drawn at most once per frame
             thread.error.connect(on_error)
+            thread.progress.connect(on_progress)
             thread.finished.connect(on_finished)
 
             # Start the worker thread
@@ -224,12 +494,97 @@ def create_breach_page(main_window, cipher) -> QWidget:
                 
         # This notifies the user that an error occured when opening password file
         except Exception as e:
-            error_label = QLabel(f"Error reading password file: {str(e)}")
-            error_label.setStyleSheet("""
-                font-size: 16px;
-            """)
-            results_layout.addRow(error_label)
+            show_message(f"Error reading password file: {str(e)}")
+
+    def use_offline():
+        return offline_box.isChecked() and os.path.exists(OFFLINE_CORPUS)
+
+    # Background check of the whole vault, slower and with fewer lookups in flight than the button
+    def make_background_thread():
+        passwords = vault.all()
+        if not passwords:
+            return None
+        return PasswordCheckerThread(offline_checker if use_offline() else background_checker, passwords, vault, MONITOR_WORKERS, state=state)
+
+    # Tell the user about new findings from a background check
+    def on_findings(count):
+        if count > 0:
+            show_message(f"A background check found {count} newly breached password(s), press Check Passwords to see them")
+
+    # Turn background checking on or off
+    def toggle_background(checked):
+        if checked:
+            monitor.start()
+        else:
+            monitor.stop()
+
+    # Show a message under the results
+    def show_message(text):
+        message_label.setText(text)
+        message_label.show()
     
-    # Connects the button to the start_check function
+    # Pause or resume the running scan
+    def toggle_pause():
+        thread = breach_page.thread
+        if thread is None:
+            return
+        if thread.engine.is_paused():
+            thread.resume()
+            pause_button.setText("Pause")
+        else:
+            thread.pause()
+            pause_button.setText("Resume")
+            status_label.setText(f"Paused after {thread.done} of {len(thread.passwords)}")
+
+    # Cancel the running scan, the lookups already in flight finish first
+    def cancel_check():
+        if breach_page.thread is not None:
+            breach_page.thread.cancel()
+            pause_button.setEnabled(False)
+            cancel_button.setEnabled(False)
+            status_label.setText("Cancelling...")
+
+    # Score every password in the vault on a worker thread and show the summary, no network needed
+    def show_health():
+        thread = HealthAuditThread(vault)
+        health_button.setEnabled(False)
+        health_button.setText("Auditing...")
+
+        def on_report(report):
+            QMessageBox.information(breach_page, "Vault Health", report.text())
+
+        # finished is sent just before the thread stops, it is waited for so it isn't destroyed while running
+        def on_finished():
+            thread.wait()
+            health_button.setEnabled(True)
+            health_button.setText("Vault Health")
+            breach_page.health_thread = None
+
+        breach_page.health_thread = thread
+        thread.report.connect(on_report)
+        thread.error.connect(show_message)
+        thread.finished.connect(on_finished)
+        thread.start()
+
+    # Stop a running scan or audit when the app closes, a scan saves a checkpoint on the way out
+    def stop_on_quit():
+        for thread in (breach_page.thread, breach_page.health_thread):
+            if thread is not None and thread.isRunning():
+                thread.cancel()
+                thread.wait()
+
+    # Re-check the vault on a schedule, never alongside a check started from this page
+    monitor = BreachMonitor(make_background_thread, lambda: breach_page.thread is not None and breach_page.thread.isRunning(), parent=breach_page)
+    monitor.findings.connect(on_findings)
+    breach_page.monitor = monitor
+    if background:
+        monitor.start()
+
+    # Connects the buttons to their functions
     check_button.clicked.connect(start_check)
+    pause_button.clicked.connect(toggle_pause)
+    cancel_button.clicked.connect(cancel_check)
+    health_button.clicked.connect(show_health)
+    background_box.toggled.connect(toggle_background)
+    QApplication.instance().aboutToQuit.connect(stop_on_quit)
     return breach_page # Return the breach page for adding to the main window
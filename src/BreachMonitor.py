@@ -0,0 +1,134 @@
+'''
+Artifact: Pic-a-Pass BreachMonitor.py
+Description: Re-checks the vault for breaches on a schedule, in the background and at low priority
+Author(s): Team
+Precondition(s): A QApplication exists and the vault has been loaded
+Postcondition(s): None
+Error(s): None, a failed background check is retried at the next interval
+Side effect(s): Makes network requests to the range api while a check runs
+Invariant(s): Never runs while a check started from the breach page is running, and holds its lookups while the user is typing
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Give way to the user without blocking the window          |
+| Team         | 10/18/26   | Keep the check's thread until it has stopped              |
+#########################################################################################
+'''
+from PyQt5.QtCore import QObject, QEvent, QThread, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+MONITOR_INTERVAL_MS = 6 * 60 * 60 * 1000 # Time between background checks
+MONITOR_FIRST_MS = 60 * 1000 # Time after login before the first background check
+MONITOR_IDLE_MS = 3000 # How long the user has to stop typing before a paused check carries on
+MONITOR_WORKERS = 2 # Lookups in flight for a background check, the breach page uses 8
+MONITOR_TIMEOUT = 5 # Seconds a background lookup waits for a response, so cancelling it never takes long
+MONITOR_RETRIES = 1 # Retries for a background lookup, a failed check is tried again at the next interval
+MONITOR_MAX_WAIT = 2.0 # Longest wait between background retries, whatever Retry-After asks for
+
+class BreachMonitor(QObject):
+    findings = pyqtSignal(int) # Number of newly breached entries not yet seen by the user
+
+    def __init__(self, make_thread, is_busy, interval_ms: int = MONITOR_INTERVAL_MS, idle_ms: int = MONITOR_IDLE_MS, parent=None):
+        '''
+        make_thread: Function () -> PasswordCheckerThread for a background check, or None if there is nothing to check
+        is_busy: Function () -> True while a check started by the user is running
+        interval_ms: Time between background checks
+        idle_ms: Quiet time after the last key press before a paused check resumes
+        '''
+        super().__init__(parent)
+        self.make_thread = make_thread
+        self.is_busy = is_busy
+        self.unseen = set() # Ids of newly breached entries the user hasn't looked at yet
+        self.thread = None
+        self._then = [] # Functions to call once the cancelled check has finished
+        self._schedule = QTimer(self)
+        self._schedule.setInterval(interval_ms)
+        self._schedule.timeout.connect(self.check_now)
+        self._idle = QTimer(self) # Restarted by every key press, resumes the check once it fires
+        self._idle.setSingleShot(True)
+        self._idle.setInterval(idle_ms)
+        self._idle.timeout.connect(self.__resume)
+        QApplication.instance().installEventFilter(self) # Sees key presses anywhere in the app
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
+
+    # Start checking on the schedule, the first check runs after first_ms
+    def start(self, first_ms: int = MONITOR_FIRST_MS) -> None:
+        self._schedule.start()
+        QTimer.singleShot(first_ms, self.check_now)
+
+    # Stop the schedule and any running check. The running check checkpoints its progress
+    def stop(self) -> None:
+        self._schedule.stop()
+        self._idle.stop()
+        self.cancel()
+
+    # Stop and wait for the running check, only when the app quits so the thread is never destroyed while running
+    def shutdown(self) -> None:
+        thread = self.thread
+        self.stop()
+        if thread is not None:
+            thread.wait()
+            self.thread = None
+
+    # True from the start of a check until its thread has stopped and been let go
+    def is_running(self) -> bool:
+        return self.thread is not None
+
+    # Give way to a check started by the user. Never waits, lookups in flight finish on the worker thread
+    # then: Optional function called once the check has finished (straight away if none is running)
+    def cancel(self, then=None) -> None:
+        if not self.is_running():
+            if then is not None:
+                then()
+            return
+        if then is not None:
+            self._then.append(then)
+        self.thread.cancel()
+
+    # Start a background check now, unless one is already running or the user is busy
+    def check_now(self) -> None:
+        if not self._schedule.isActive() or self.is_running() or self.is_busy():
+            return
+        thread = self.make_thread()
+        if thread is None:
+            return
+        self.thread = thread
+        thread.finished.connect(self.__on_finished) # QThread's own, sent once run() has returned
+        if self._idle.isActive(): # User is typing right now, wait for them to stop
+            thread.pause()
+        thread.start(QThread.LowestPriority)
+
+    # The user has seen the breach page, so the current findings are no longer new
+    def acknowledge(self) -> None:
+        self.unseen.clear()
+        self.findings.emit(0)
+
+    # Pause the check on every key press, it resumes once typing stops for a while
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() in (QEvent.KeyPress, QEvent.InputMethod):
+            if self.is_running():
+                self.thread.pause()
+            self._idle.start()
+        return False # Never swallow the event
+
+    def __resume(self) -> None:
+        if self.is_running():
+            self.thread.resume()
+
+    def __on_finished(self) -> None:
+        thread = self.thread
+        if thread is not None:
+            thread.wait() # Returns at once, the thread is on its way out. Let go of it any sooner and Qt aborts
+        self.thread = None
+        then, self._then = self._then, []
+        for function in then: # is_running() is already False for these
+            function()
+        if thread is None or thread.is_cancelled():
+            return
+        new = thread.newly_breached() - self.unseen
+        if new:
+            self.unseen |= new
+            self.findings.emit(len(self.unseen))
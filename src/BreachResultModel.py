@@ -0,0 +1,189 @@
+'''
+Artifact: Pic-a-Pass BreachResultModel.py
+Description: Table model for breach check results, filled in batches and redrawn at most once per frame
+Author(s): Team
+Precondition(s): A QApplication exists
+Postcondition(s): None
+Error(s): None
+Side effect(s): None
+Invariant(s): Rows added between two frames reach the view as a single update
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+#########################################################################################
+'''
+import bisect # Used for placing new results in sorted order
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+
+FRAME_MS = 16 # Rows are held back this long so a burst of results is one update
+
+# One row of the results table. count is None when the entry couldn't be checked
+class BreachResult:
+    __slots__ = ("website", "username", "count", "error", "arrival")
+
+    def __init__(self, website: str, username: str, count: int = None, error: str = None):
+        self.website = website
+        self.username = username
+        self.count = count
+        self.error = error
+        self.arrival = 0 # Position in the order results arrived, set by the model and used to break ties
+
+    # Text of the result column
+    def summary(self) -> str:
+        if self.error is not None:
+            return self.error
+        return f"Breached {self.count:,} times"
+
+# Results table. Sorting and filtering are done here on plain Python lists instead of a proxy,
+# a proxy would call data() for every comparison. Rows are kept in ascending order with their
+# sort keys alongside, so new results are placed with a binary search instead of a full sort
+class BreachResultModel(QAbstractTableModel):
+    HEADERS = ["Website", "Username", "Result"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.results = [] # Every result, in the order they arrived
+        self.visible = [] # Results that pass the filter, ascending by the sort key (arrival order when unsorted)
+        self._keys = [] # Sort key of every visible result, same order
+        self._pending = [] # Results waiting for the next frame
+        self._filter = ""
+        self._sort_column = None # None keeps arrival order
+        self._descending = False # Rows are read back to front when sorted descending
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FRAME_MS)
+        self._timer.timeout.connect(self.flush)
+
+    # Queue a batch of results, shown on the next frame
+    def add_results(self, results: list) -> None:
+        self._pending.extend(results)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    # Show every queued result now
+    def flush(self) -> None:
+        self._timer.stop()
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        for result in pending:
+            result.arrival = len(self.results)
+            self.results.append(result)
+        added = [result for result in pending if self.__matches(result)]
+        if not added:
+            return
+        if self._sort_column is None: # Arrival order, the new rows just go on the end
+            self.beginInsertRows(QModelIndex(), len(self.visible), len(self.visible) + len(added) - 1)
+            self.visible.extend(added)
+            self._keys.extend(result.arrival for result in added)
+            self.endInsertRows()
+            return
+        key = self.__sort_key(self._sort_column)
+        self.layoutAboutToBeChanged.emit()
+        old_indexes, old_results = self.__persistent_results()
+        for result in added:
+            result_key = key(result)
+            position = bisect.bisect_right(self._keys, result_key)
+            self._keys.insert(position, result_key)
+            self.visible.insert(position, result)
+        self.__restore_persistent(old_indexes, old_results)
+        self.layoutChanged.emit()
+
+    # Remove every result, e.g. when a new scan starts
+    def clear(self) -> None:
+        self._timer.stop()
+        self.beginResetModel()
+        self.results, self.visible, self._keys, self._pending = [], [], [], []
+        self.endResetModel()
+
+    # Only show results whose website, username or result contain text (case insensitive)
+    def set_filter(self, text: str) -> None:
+        self.flush()
+        self._filter = text.casefold()
+        self.__relayout([result for result in self.results if self.__matches(result)])
+
+    # Number of results, filtered or not, including ones not shown yet
+    def total(self) -> int:
+        return len(self.results) + len(self._pending)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid(): # Flat table, no children
+            return 0
+        return len(self.visible)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        result = self.result_at(index.row())
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return (result.website, result.username, result.summary())[column]
+        if role == Qt.ToolTipRole and column == 2:
+            return result.summary()
+        return None
+
+    # BreachResult shown in a row
+    def result_at(self, row: int):
+        return self.visible[-1 - row] if self._descending else self.visible[row]
+
+    # Called by the view when a header is clicked
+    def sort(self, column: int, order=Qt.AscendingOrder) -> None:
+        self.flush()
+        self._sort_column = column
+        self._descending = order == Qt.DescendingOrder
+        self.__relayout(self.visible)
+
+    def __matches(self, result) -> bool:
+        if not self._filter:
+            return True
+        return any(self._filter in text.casefold() for text in (result.website, result.username, result.summary()))
+
+    # Breach count sorts numerically, entries that failed to check come before any count.
+    # Arrival order breaks ties so equal rows keep a stable order
+    def __sort_key(self, column):
+        if column is None:
+            return lambda result: result.arrival
+        if column == 2:
+            return lambda result: (-1 if result.count is None else result.count, result.arrival)
+        if column == 1:
+            return lambda result: (result.username.casefold(), result.arrival)
+        return lambda result: (result.website.casefold(), result.arrival)
+
+    # Swap in a new set of rows, sorted by the current column, in one update keeping the selection on the same results
+    def __relayout(self, results: list) -> None:
+        self.layoutAboutToBeChanged.emit()
+        old_indexes, old_results = self.__persistent_results()
+        key = self.__sort_key(self._sort_column)
+        keyed = sorted(((key(result), result) for result in results), key=lambda pair: pair[0])
+        self._keys = [pair[0] for pair in keyed]
+        self.visible = [pair[1] for pair in keyed]
+        self.__restore_persistent(old_indexes, old_results)
+        self.layoutChanged.emit()
+
+    # Indexes the view holds on to (selection, current item) and the results they point at
+    def __persistent_results(self) -> tuple:
+        old_indexes = self.persistentIndexList()
+        return old_indexes, [self.result_at(index.row()) if index.row() < len(self.visible) else None for index in old_indexes]
+
+    def __restore_persistent(self, old_indexes, old_results) -> None:
+        row_of = {id(result): row for row, result in enumerate(self.visible)} if old_indexes else {}
+        new_indexes = []
+        for index, result in zip(old_indexes, old_results):
+            row = row_of.get(id(result))
+            if row is not None and self._descending:
+                row = len(self.visible) - 1 - row
+            new_indexes.append(QModelIndex() if row is None else self.index(row, index.column()))
+        self.changePersistentIndexList(old_indexes, new_indexes)
@@ -17,20 +17,23 @@ Known fault(s): None
 | Jesse DeBok  | 11/24/24   | Check strength and bug fixes                              |
 | Jesse DeBok  | 11/26/24   | Refreshes main page                                       |
 | Full Team    | 12/8/24    | Added final comments to the document and color changes    |
+| Team         | 10/18/26   | Save through the shared vault repository                  |
+| Team         | 10/18/26   | Score strength once per change through the cached service |
+| Team         | 10/18/26   | Incremental strength while typing                         |
 #########################################################################################
 '''
 import sys
-import csv
-import time
 from generatepassword import PasswordGenerator
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QFormLayout, QLineEdit, QPushButton, QMessageBox, QLabel, QHBoxLayout
 from PyQt5.QtGui import QFont
-from password_strength import p_strength #password strength function
+from strengthestimator import StrengthEstimator #strength of the text typed so far
 class EditPasswordProfile(QWidget):
-    def __init__(self, super_window, super_object, label, password_profile_window, hash, cipher):
+    def __init__(self, super_window, super_object, label, password_profile_window, hash, cipher, vault):
         super().__init__()
         self.hash = hash #from sign in page
         self.cipher = cipher #from sign in page
+        self.vault = vault #shared vault repository
+        self.record = label #record being edited
         self.super_object = super_object #used for refreshing
         self.initUI( super_window, label, password_profile_window ) #create page
 
@@ -43,32 +46,30 @@ class EditPasswordProfile(QWidget):
         #website
         self.label_website = QLabel( "Website" )
         self.layout.addWidget( self.label_website )
-        self.label_websiteReal = QLineEdit( label[ 0 ] ) #set label as website name
+        self.label_websiteReal = QLineEdit( label.website ) #set label as website name
         self.label_websiteReal.setReadOnly( True )
         self.layout.addWidget( self.label_websiteReal )
         #Username
         self.label_uname = QLabel( "Username" )
         self.layout.addWidget( self.label_uname )
-        self.label_unameReal = QLineEdit( label[ 1 ] ) #set label as user name
+        self.label_unameReal = QLineEdit( label.username ) #set label as user name
         self.layout.addWidget( self.label_unameReal )
         #Password
         self.label_pw = QLabel( "Password" )
         self.layout.addWidget( self.label_pw )
-        password = label[ 2 ]
-        nonce = label[ 5 ]
-        auth_data = label[ 1 ].encode('utf-8') # Use the username of the password as the authentication data
-        self.label_pwReal = QLineEdit( password ) # Set label as password
+        self.label_pwReal = QLineEdit( label.secret ) # Set label as password
         self.layout.addWidget( self.label_pwReal )
         #show password strength
         self.strength_label = QLabel( "Password strength: Waiting..." )
         self.strength_label.setFont(QFont("Arial", 14))
         self.layout.addWidget( self.strength_label )
+        self.estimator = StrengthEstimator() #only looks at new characters as they are typed
         self.label_pwReal.textChanged.connect(self.check_password_strength)
         self.check_password_strength() #sets original colors
         #Notes
         self.label_note = QLabel( "Notes" )
         self.layout.addWidget( self.label_note )
-        self.label_noteReal = QLineEdit( label[ 3 ] ) #set label as user name
+        self.label_noteReal = QLineEdit( label.notes ) #set label as user name
         self.layout.addWidget( self.label_noteReal )
         #Add "Edit Password Profile" button to the bottom
         # Generate button
@@ -86,52 +87,33 @@ class EditPasswordProfile(QWidget):
         
         self.setLayout( self.layout)
     def save_to_csv(self):
-        # Get values from input fields
-        auth_data = self.label_unameReal.text().encode('utf-8')
-        ciphertext, nonce = self.cipher.encrypt(self.label_pwReal.text(), auth_data)
-        data = [
-            self.label_websiteReal.text(),
-            self.label_unameReal.text(),
-            ciphertext.decode('utf-8'),
-            self.label_noteReal.text(),
-            time.time(),
-            nonce.decode('utf-8')
-        ] #save nonce as well
-
-        # Open file dialog to choose where to save the CSV
-        file_path = "passwords.csv"
-        
-        #save info from csv file except for my edit one
-        lines_to_keep = []
-    
-        with open(file_path, mode='r', newline='') as csv_file:
-            reader = csv.reader(csv_file)
-            
-            # Iterate over each row in the CSV
-            for row in reader:
-                # If the value in the specified column does not match, keep the line
-                if len(row) > 0:
-                    if row[ 0 ] != self.label_websiteReal.text():
-                        lines_to_keep.append(row)
-
-        lines_to_keep.append( data ) #save new info
-        # Write the lines back to the CSV file
-        with open(file_path, mode='w', newline='') as csv_file:
-            writer = csv.writer(csv_file)
-            writer.writerows(lines_to_keep)
+        # Update the record in place, the vault re-encrypts it and appends the change to the journal
+        try:
+            self.vault.update(
+                self.record.id,
+                self.label_websiteReal.text(),
+                self.label_unameReal.text(),
+                self.label_pwReal.text(),
+                self.label_noteReal.text()
+            ) #new timestamp and nonce are filled in by the vault
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save data: {e}")
         self.super_object.refresh() #refresh main page
     def generate_pw( self ):
         pw = PasswordGenerator() #use password generator
         self.label_pwReal.setText( pw.generate_password() )
     def check_password_strength( self ):
-        if self.label_pwReal.text() == "":
+        password = self.label_pwReal.text()
+        self.estimator.update( password )
+        if password == "":
             #do nothing, prevents crashing
-            a = 1
-        elif p_strength( self.label_pwReal.text() ) == 0:
+            return
+        strength = self.estimator.strength()
+        if strength == 0:
             #weak
             self.strength_label.setText("Password strength: Weak")
             self.strength_label.setStyleSheet("color: red;")
-        elif p_strength( self.label_pwReal.text() ) == 1:
+        elif strength == 1:
             self.strength_label.setText("Password strength: Medium")
             self.strength_label.setStyleSheet("color: orange;")
         else:
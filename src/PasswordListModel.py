@@ -0,0 +1,88 @@
+'''
+Artifact: Pic-a-Pass PasswordListModel.py
+Description: Model and delegate used to show the vault in a virtualized list view
+Author(s): Team
+Precondition(s): Vault repository has been loaded
+Postcondition(s): None
+Error(s): None
+Side effect(s): None
+Invariant(s): Only rows visible in the view are ever painted
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Search results come from the vault index, proxy removed   |
+#########################################################################################
+'''
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRectF
+from PyQt5.QtGui import QFont, QColor, QPainter, QPainterPath, QPen, QRadialGradient
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+
+RecordRole = Qt.UserRole # Role that returns the whole PasswordRecord
+
+# List model over the records of the vault. Holds references only, no widgets per record
+class PasswordListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = [] # PasswordRecords shown by the model
+
+    # Replace every record in the model. Records are shown in the order given, sorting and
+    # searching happen in the vault (see VaultRepository.ordered and VaultRepository.search)
+    def set_records(self, records: list) -> None:
+        self.beginResetModel()
+        self.records = list(records)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid(): # Flat list, no children
+            return 0
+        return len(self.records)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self.records[index.row()]
+        if role == Qt.DisplayRole:
+            return record.website
+        if role == RecordRole:
+            return record
+        return None
+
+# Paints each row to look like the old per-entry push buttons
+class PasswordItemDelegate(QStyledItemDelegate):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont("Arial", 16)
+        self.font.setPixelSize(24) # Same size as the old button stylesheet
+        self.ROW_HEIGHT = 48 # Height of a row, padding included
+        self.SPACING = 6 # Space between rows
+
+    def sizeHint(self, option, index) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT + self.SPACING)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = QRectF(option.rect).adjusted(1, self.SPACING / 2, -1, -self.SPACING / 2)
+
+        # Same radial gradient as the old buttons, darker when hovered
+        gradient = QRadialGradient(rect.topRight(), rect.width())
+        if option.state & QStyle.State_MouseOver:
+            gradient.setColorAt(0, QColor("#001F3B"))
+            gradient.setColorAt(1, QColor("#001228"))
+        else:
+            gradient.setColorAt(0, QColor("#003461"))
+            gradient.setColorAt(1, QColor("#001F41"))
+        path = QPainterPath()
+        path.addRoundedRect(rect, 5, 5)
+        painter.fillPath(path, gradient)
+        painter.setPen(QPen(QColor("black"), 1))
+        painter.drawPath(path)
+
+        # Website name centered in the row
+        painter.setPen(QColor("white"))
+        painter.setFont(self.font)
+        painter.drawText(rect.adjusted(5, 0, -5, 0), Qt.AlignCenter, index.data(Qt.DisplayRole))
+        painter.restore()
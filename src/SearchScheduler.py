@@ -0,0 +1,82 @@
+'''
+Artifact: Pic-a-Pass SearchScheduler.py
+Description: Debounces search bar keystrokes and runs the search on a worker thread
+Author(s): Team
+Precondition(s): A QApplication exists
+Postcondition(s): None
+Error(s): None
+Side effect(s): Runs the search function on a background thread
+Invariant(s): Only the result of the newest query is ever delivered
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+#########################################################################################
+'''
+from concurrent.futures import ThreadPoolExecutor # Single worker thread for searching
+import threading # Used for the generation counter lock
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+class SearchScheduler(QObject):
+    results_ready = pyqtSignal(str, object) # Query and its result, delivered on the GUI thread
+    search_failed = pyqtSignal(str, str) # Query and error message
+
+    def __init__(self, search_func, delay_ms: int = 150, parent=None):
+        '''
+        search_func: Function (query, cancelled) -> result. Runs on the worker thread and should
+                     return early if cancelled() becomes true
+        delay_ms: How long typing has to pause before a search starts
+        '''
+        super().__init__(parent)
+        self.search_func = search_func
+        self._query = "" # Query waiting for the debounce timer
+        self._generation = 0 # Bumped for every new query, older searches are stale
+        self._lock = threading.Lock()
+        self._worker = ThreadPoolExecutor(max_workers=1) # One search at a time, newest wins
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(lambda: self.run_now(self._query))
+
+    # Search for query once typing pauses. Every call restarts the wait
+    def schedule(self, query: str) -> None:
+        self._query = query
+        self.__next_generation() # Anything already running is now stale
+        self._timer.start()
+
+    # Search for query straight away, e.g. after the list has been refreshed
+    def run_now(self, query: str) -> None:
+        self._timer.stop()
+        generation = self.__next_generation()
+        self._worker.submit(self.__run, query, generation)
+
+    # Stop any pending or running search
+    def cancel(self) -> None:
+        self._timer.stop()
+        self.__next_generation()
+
+    # Wait for the worker to stop. Call before the application exits
+    def shutdown(self) -> None:
+        self.cancel()
+        self._worker.shutdown(wait=True)
+
+    def __next_generation(self) -> int:
+        with self._lock:
+            self._generation += 1
+            return self._generation
+
+    # Worker thread body. Stale searches are skipped or abandoned part way
+    def __run(self, query: str, generation: int) -> None:
+        cancelled = lambda: generation != self._generation
+        if cancelled(): # A newer query arrived while this one was queued
+            return
+        try:
+            result = self.search_func(query, cancelled)
+        except Exception as e:
+            if not cancelled():
+                self.search_failed.emit(query, str(e))
+            return
+        if not cancelled(): # Emitting from the worker queues the signal onto the GUI thread
+            self.results_ready.emit(query, result)
@@ -20,25 +20,33 @@ Known fault(s): None
 | Jack Ford    | 12/05/24   | Visuals                                                   |
 | Caden        | 12/06/24   | Visuals                                                   |
 | Jesse DeBok  | 12/08/24   | Comments                                                  |
+| Team         | 10/18/26   | Read records from the shared vault repository             |
+| Team         | 10/18/26   | Virtualized model/view list instead of one button per row |
+| Team         | 10/18/26   | Indexed and fuzzy searching                               |
+| Team         | 10/18/26   | Debounced searching on a worker thread                    |
+| Team         | 10/18/26   | Cached password strength                                  |
+| Team         | 10/18/26   | Show why a search failed                                  |
 #########################################################################################
 '''
 import sys, time, pytz
 from datetime import datetime, timezone #to fix the time output
-from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton, QScrollArea, QVBoxLayout, QHBoxLayout, QFrame, QLabel, QDialog
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLineEdit, QPushButton, QListView, QAbstractItemView, QHBoxLayout, QFrame, QLabel, QDialog
 from PyQt5 import QtCore
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont, QIcon
 import AddPasswordProfile
 import EditPasswordProfile
-import csv #for reading from csv and creating buttons
 import OptionsWindow
-from password_strength import p_strength #password strength function
+import PasswordListModel
+import SearchScheduler
+from strengthservice import strength_service #cached password strength
 
 class PasswordProfile( QWidget ):
-    def __init__(self, label, pw_page, hash, cipher):
+    def __init__(self, label, pw_page, hash, cipher, vault):
         super().__init__()
         self.hash = hash #from sign in page
         self.cipher = cipher #from sign in page
+        self.vault = vault #shared vault repository
         self.password_visible = False # Init to false because password is initially not visible
         self.initUI(label, pw_page) #create window
 
@@ -50,13 +58,13 @@ class PasswordProfile( QWidget ):
         layout = QVBoxLayout() #layout of buttons
         labels = [ "Website", "Username", "Password", "Notes", "Last Updated" ]
         c = 0 #counter for special
-        for item in label[:-2]: #get all but the last one (as need to format it)
+        for item in [ label.website, label.username, label.secret, label.notes ]: #all but the timestamp (as need to format it)
             if c == 2:
                 #password so is special
                 label_top = QLabel(labels[ c ])
                 c = c + 1  #counter for Labels
                 layout.addWidget( label_top )
-                self.password_label = QLabel("*" * len(item)) #already decrypted from loading it in
+                self.password_label = QLabel("*" * len(item)) #decrypted by the record when it was first read
                 self.password_label.setTextInteractionFlags( Qt.TextSelectableByMouse ) #set selectable flag
                 #special labels so have a different style
                 self.password_label.setStyleSheet("""
@@ -91,10 +99,11 @@ class PasswordProfile( QWidget ):
                 layout.addLayout(button_layout) # Finally, add the buttons to the layout
 
                 self.strength_label = QLabel( "Password strength: Weak" )
-                if p_strength( item ) == 0:
+                strength = strength_service().strength( item ) #scored once, reopening the profile is a cache hit
+                if strength == 0:
                     #weak
                     self.strength_label.setStyleSheet("color: red;")
-                elif p_strength( item ) == 1:
+                elif strength == 1:
                     self.strength_label.setText("Password strength: Medium")
                     self.strength_label.setStyleSheet("color: orange;")
                 else:
@@ -121,10 +130,10 @@ class PasswordProfile( QWidget ):
         #Fix time
         label_top = QLabel(labels[ c ]) # Set label to correct label
         layout.addWidget( label_top ) # Add label as widget
-        utc_time = datetime.fromtimestamp( float( label[ 4 ] ), tz=timezone.utc) #fix time
+        utc_time = datetime.fromtimestamp( label.timestamp, tz=timezone.utc) #fix time
         central_tz = pytz.timezone('America/Chicago') #convert to central time (Best time)
         central_now = utc_time.astimezone(central_tz)
-        self.label_widget = QLabel(f"{central_now.strftime("%m-%d-%Y %H:%M")}")
+        self.label_widget = QLabel(f"{central_now.strftime('%m-%d-%Y %H:%M')}")
         #special labels so have a different style
         self.label_widget.setStyleSheet("""
              QLabel {
@@ -152,7 +161,7 @@ class PasswordProfile( QWidget ):
         #Pull up password profile screen
         self.edit_password_window.setWindowTitle( "Edit Password Profile" ) #set window title
         self.edit_password_window.resize( 900, 600 ) #standard size
-        widg = EditPasswordProfile.EditPasswordProfile( self.edit_password_window, pw_page, label, self, self.hash, self.cipher ) #create widget to create a new password profile
+        widg = EditPasswordProfile.EditPasswordProfile( self.edit_password_window, pw_page, label, self, self.hash, self.cipher, self.vault ) #create widget to create a new password profile
         layout = QVBoxLayout() #create layout for this widget
         layout.addWidget( widg ) #add the password profile class oto the layout
         self.edit_password_window.setLayout( layout ) #set the layout to this widget
@@ -175,11 +184,17 @@ class PasswordProfile( QWidget ):
         clipboard.setText(text) # Set the text of the clipboard
 
 class SearchableButtonList(QWidget):
-    def __init__(self, hash, cipher):
+    def __init__(self, hash, cipher, vault):
         super().__init__()
         self.hash = hash #from sign in page
         self.cipher = cipher #from sign in page
+        self.vault = vault #shared vault repository, loaded once after login
         self.order = 3 #set default order
+        self.ordered = [] #records in the current order
+        self.rank = {} #record id -> position in self.ordered, used to keep search results in order
+        self.search = SearchScheduler.SearchScheduler(self.find_records, parent=self) #runs searches on a worker thread
+        self.search.results_ready.connect(self.show_results)
+        self.search.search_failed.connect(self.show_search_error)
         self.initUI() #create window
 
     def initUI(self):
@@ -195,7 +210,7 @@ class SearchableButtonList(QWidget):
             font-size: 24px;
         """)
         self.search_bar.setPlaceholderText("Search...")
-        self.search_bar.textChanged.connect(self.filter_buttons)
+        self.search_bar.textChanged.connect(lambda text: self.search.schedule(text)) #debounced, searched off the GUI thread
         self.search_bar.setFont(QFont("Arial", 16))  # Set font size to 16
 
         search_pw_layout.addWidget( self.search_bar ) #add to top bar
@@ -235,10 +250,23 @@ class SearchableButtonList(QWidget):
         self.options.clicked.connect(lambda: self.create_options())  # Connect click event add password
         search_pw_layout.addWidget( self.options )
         self.main_layout.addLayout( search_pw_layout )
+        #why the last search failed, hidden until one does
+        self.search_error = QLabel( "", self )
+        self.search_error.setStyleSheet( "color: red;" )
+        self.search_error.hide()
+        self.main_layout.addWidget( self.search_error )
         
-        # Scrollable area setup
-        self.scroll_area = QScrollArea(self)
-        self.scroll_area.setStyleSheet("""
+        # Virtualized list setup, only the visible rows are painted
+        self.model = PasswordListModel.PasswordListModel(self)
+        self.list_view = QListView(self)
+        self.list_view.setModel(self.model)
+        self.list_view.setItemDelegate(PasswordListModel.PasswordItemDelegate(self.list_view))
+        self.list_view.setUniformItemSizes(True) #every row is the same height so Qt can skip measuring them
+        self.list_view.setMouseTracking(True) #needed for the hover color
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.list_view.setStyleSheet("""
             background: qradialgradient(
                 cx:1, cy:0,		 /* Center at top-right */
                 radius:1.5, 	 /* Radius goes outside the radius of the screen */
@@ -247,8 +275,8 @@ class SearchableButtonList(QWidget):
                 stop:1 #043b00 	 /* Darker than we actually see because radius is larger than we see */
             );
         """)
-        self.scroll_area.setWidgetResizable(True)
-        self.main_layout.addWidget( self.scroll_area )
+        self.list_view.clicked.connect(lambda index: self.button_clicked(index.data(PasswordListModel.RecordRole)))  # Connect click event
+        self.main_layout.addWidget( self.list_view )
         self.refresh( )
         #Add "Add password" button to the bottom
         add_pw_layout = QHBoxLayout() #create a new layout on the bottom to right justify the add button.
@@ -290,20 +318,39 @@ class SearchableButtonList(QWidget):
         self.main_layout.addLayout( add_pw_layout ) #add button to bottom of vertical layout
 
     def filter_buttons(self):
-        search_text = self.search_bar.text().lower()
-        for button in self.buttons:
-            button.setVisible(search_text in button.text().lower())
+        #search for the current text straight away, results arrive in show_results
+        self.search.run_now( self.search_bar.text() )
+    def find_records( self, search_text, cancelled ):
+        #runs on the search worker thread, so only read from the vault here
+        ordered, rank = self.ordered, self.rank #refresh may swap these out while searching
+        matches = self.vault.search( search_text ) #ids of matching records from the search index
+        if matches is None:
+            #empty search shows everything
+            return ordered
+        if matches:
+            #keep the matches in the list order, only the matches are sorted
+            records = ( self.vault.get( i ) for i in matches )
+            return sorted( ( r for r in records if r is not None and r.id in rank ), key=lambda x: rank[ x.id ] )
+        #nothing contains the text, show close matches instead (typos)
+        return self.vault.fuzzy_search( search_text, cancelled=cancelled )
+    def show_results( self, search_text, records ):
+        #back on the GUI thread, only the newest search ever gets here
+        self.search_error.hide()
+        self.model.set_records( records )
+    def show_search_error( self, search_text, message ):
+        #the search raised on the worker thread, the list keeps its last results
+        self.search_error.setText( f"Search failed: {message}" )
+        self.search_error.show()
     def button_clicked(self, label): #Control what happens when buttons are clicked.  Open up password profile display screen
-        #label is all of the information
-        #Labels look like: weburl, username, password, notes, timestamp
+        #label is the PasswordRecord with all of the information
         # Open a new window with the password profile
-        self.button_window = PasswordProfile(label, self, self.hash, self.cipher) #pass in this window as suber object so it can be refreshed upon editing
+        self.button_window = PasswordProfile(label, self, self.hash, self.cipher, self.vault) #pass in this window as suber object so it can be refreshed upon editing
     def add_password( self ):
         self.add_password_window = QWidget()
         #Pull up password profile screen
         self.add_password_window.setWindowTitle( "Create Password Profile" ) #set window title
         self.add_password_window.resize( 900, 600 ) #standard size
-        widg = AddPasswordProfile.AddPasswordProfile( self.add_password_window, self, self.hash, self.cipher ) #create widget to create a new password profile
+        widg = AddPasswordProfile.AddPasswordProfile( self.add_password_window, self, self.hash, self.cipher, self.vault ) #create widget to create a new password profile
         layout = QVBoxLayout() #create layout for this widget
         layout.addWidget( widg ) #add the password profile class oto the layout
         self.add_password_window.setLayout( layout ) #set the layout to this widget
@@ -327,66 +374,7 @@ class SearchableButtonList(QWidget):
         self.refresh() #reset order for new update
     def refresh( self ):
         #order: 1 = alphabetical, 2 = reverse alphabetical, 3 = newest, 4 = oldest
-        #refresh data
-        scroll_content = QWidget()
-        self.scroll_layout = QVBoxLayout(scroll_content)
-        self.scroll_area.setWidget(scroll_content)
-        
-        # Create buttons
-        self.buttons = []
-        with open( 'passwords.csv', 'r' ) as file:
-            reader = csv.reader( file )
-            data = list( reader )
-        if (len(data) > 0):
-            if (len(data[0]) > 0): # Don't sort if list is empty
-                if self.order == 1:
-                    #order alphabetical
-                    data.sort( key=lambda x: x[0], reverse=False ) #sort by timestamp
-                elif self.order == 2:
-                    #reverse alphabetical
-                    data.sort( key=lambda x: x[0], reverse=True ) #sort by timestamp
-                elif self.order == 3:
-                    #newest
-                    data.sort( key=lambda x: x[-2], reverse=True ) #sort by timestamp
-                else:
-                    #oldest
-                    data.sort( key=lambda x: x[-2], reverse=False ) #sort by timestamp
-
-        for label in data: #Labels look like: weburl, username, password, notes, timestamp, nonce
-            if len(label) > 0:
-                button = QPushButton(label[ 0 ], self)
-                button.setStyleSheet("""
-                    QPushButton {
-                        background: qradialgradient(
-                            cx:1, cy:0,
-                            radius:1,
-                            fx:1, fy:0,
-                            stop:0 #003461,
-                            stop:1 #001F41
-                        );
-                        color: white;
-                        border-style: outset;
-                        border-width: 1px;
-                        border-radius: 5px;
-                        border-color: black;
-                        padding: 5px;
-                        font-size: 24px;
-                    }
-                    
-                    QPushButton:hover {
-                        background: qradialgradient(
-                            cx:1, cy:0,
-                            radius:1,
-                            fx:1, fy:0,
-                            stop:0 #001F3B,
-                            stop:1 #001228
-                        );
-                    }
-                """)
-                button.setVisible(True) #make them display in the scroll area 
-                label[2] = self.cipher.decrypt(label[2], label[5], label[1].encode('utf-8'))
-                button.clicked.connect(lambda checked, l=label: self.button_clicked(l))  # Connect click event
-                button.setFont(QFont("Arial", 16))  # Set font size to 16
-                self.buttons.append(button)
-                self.scroll_layout.addWidget(button)
-        self.filter_buttons() #also filter the buttons
+        #refresh data from the vault, the view only paints the rows on screen
+        self.ordered = self.vault.ordered( self.order ) #sorted by the vault, no widgets are recreated
+        self.rank = { record.id: i for i, record in enumerate( self.ordered ) }
+        self.filter_buttons() #also filter the list
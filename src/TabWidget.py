@@ -17,10 +17,23 @@ Known fault(s): None
 | Jesse DeBok  | 12/06/24   | Comments                                                  |
 | Team         | 12/07/24   | Visuals                                                   |
 | Jesse DeBok  | 12/08/24   | Add comments                                              |
+| Team         | 10/18/26   | Notification badges                                       |
 #########################################################################################
 '''
 from PyQt5 import QtWidgets, QtCore #Needed imports
+from PyQt5 import QtGui #Needed for painting the badges
 class TabBar(QtWidgets.QTabBar): #used within the TabWidget class.  This is the tabs on the side
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.badges = {} #tab index -> number shown in the badge
+
+    def set_badge(self, index, count): #show a red badge with count on a tab, 0 removes it
+        if count > 0:
+            self.badges[index] = count
+        else:
+            self.badges.pop(index, None)
+        self.update() #repaint the tabs
+
     def tabSizeHint(self, index): #used for formatting
         s = QtWidgets.QTabBar.tabSizeHint(self, index) #get the size of this tab
         s.transpose() #rotate the tab
@@ -46,9 +59,30 @@ class TabBar(QtWidgets.QTabBar): #used within the TabWidget class.  This is the
             painter.translate(-c) #move tab back so now it is correct location and orientation
             painter.drawControl(QtWidgets.QStyle.CE_TabBarTabLabel, opt); #Label the tab
             painter.restore() #finish execution
+            if i in self.badges: #draw the badge in the top right corner of the tab
+                self.paint_badge(painter, self.tabRect(i), self.badges[i])
+
+    def paint_badge(self, painter, rect, count): #red circle with the count inside
+        text = str(count) if count < 100 else "99+"
+        badge = QtCore.QRectF(rect.right() - 40, rect.top() + 8, 32, 32)
+        painter.save()
+        painter.setRenderHint(QtGui.QPainter.Antialiasing)
+        painter.setPen(QtCore.Qt.NoPen)
+        painter.setBrush(QtGui.QColor("#C62828"))
+        painter.drawEllipse(badge)
+        painter.setPen(QtGui.QColor("white"))
+        font = painter.font()
+        font.setBold(True)
+        font.setPixelSize(14)
+        painter.setFont(font)
+        painter.drawText(badge, QtCore.Qt.AlignCenter, text)
+        painter.restore()
 
 class TabWidget(QtWidgets.QTabWidget):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.setTabBar(TabBar(self))
         self.setTabPosition(QtWidgets.QTabWidget.West)
+
+    def set_badge(self, index, count): #notification badge on a tab, 0 removes it
+        self.tabBar().set_badge(index, count)
@@ -22,15 +22,27 @@ Known fault(s): None
 | Team         | 12/06/24   | Visuals                                                   |
 | Team         | 12/07/24   | Visuals                                                   |
 | Jesse DeBok  | 12/08/24   | Comments and Visuals                                      |
+| Team         | 10/18/26   | Shared vault repository created after login               |
+| Team         | 10/18/26   | Close the vault journal on exit                           |
+| Team         | 10/18/26   | Selectable storage backend                                |
+| Team         | 10/18/26   | Locale aware alphabetical ordering                        |
+| Team         | 10/18/26   | Background breach checks with a badge on the tab          |
+| Team         | 10/18/26   | Forget cached password strengths on exit                  |
+| Team         | 10/18/26   | Expire decrypted passwords, forget them on hide and exit  |
+| Team         | 10/18/26   | Forget cached password strengths on hide and minimize     |
 #########################################################################################
 '''
 from Breach import create_breach_page
 from cryptoutils import PasswordHash, PasswordCipher 
+from vault import VaultRepository
+from vaultstorage import open_storage
+from strengthservice import strength_service
 import sys
 import csv
+import locale
 from PyQt5.QtWidgets import QMainWindow, QWidget, QShortcut
 from PyQt5.QtGui import QPixmap, QKeySequence
-from PyQt5.QtCore import Qt, QEvent
+from PyQt5.QtCore import Qt, QEvent, QTimer
 import TabWidget #from file in directory
 import SplashScreen
 import SearchableButtonList
@@ -49,6 +61,15 @@ from PyQt5.QtWidgets import (
     QDialog
 )
 
+#Where the vault is saved: "journal" (passwords.log), "sqlite" (passwords.db) or "csv" (passwords.csv)
+STORAGE_BACKEND = "journal"
+
+#Re-check the vault for breaches every few hours in the background (can be turned off on the breach page)
+BACKGROUND_BREACH_CHECKS = True
+
+#How often decrypted passwords past their cache time are dropped, in milliseconds
+SECRET_SWEEP_MS = 5000
+
 #USE QDialog as it blocks creation of other windows until it has finished executing
 class LoginScreen(QDialog):
     def __init__(self, my_hash, my_cipher):
@@ -189,9 +210,14 @@ class SignupScreen(QDialog):
 # Signup Screen class
 # Subclass QMainWindow to customize your application's main window
 class MainWindow(QMainWindow):
-    def __init__(self, my_hash, my_cipher):
+    def __init__(self, my_hash, my_cipher, vault):
         super().__init__()
         self.setWindowTitle("Pic-A-Pass")
+        self.vault = vault
+        #drop decrypted passwords once their cache time is up, even if nothing reads the vault
+        self.secret_timer = QTimer( self )
+        self.secret_timer.timeout.connect( vault.expire_secrets )
+        self.secret_timer.start( SECRET_SWEEP_MS )
         #create central widget, everything is on this
         wid = QWidget( self )
         self.setCentralWidget( wid )
@@ -200,14 +226,14 @@ class MainWindow(QMainWindow):
        
 
         #password page
-        self.pw_page = SearchableButtonList.SearchableButtonList( my_hash, my_cipher )
+        self.pw_page = SearchableButtonList.SearchableButtonList( my_hash, my_cipher, vault )
         self.pw_page.setObjectName("pw")
 
         with open("styles.qss", "r") as file:
             self.pw_page.setStyleSheet(file.read())
         
         #breach page
-        self.breach_page = create_breach_page(self, my_cipher)
+        self.breach_page = create_breach_page(self, my_cipher, vault, BACKGROUND_BREACH_CHECKS)
         self.breach_page.setObjectName("breach")
 
         with open("styles.qss", "r") as file:
@@ -222,15 +248,31 @@ class MainWindow(QMainWindow):
         self.w.addTab( self.breach_page, "Breaches") #set the widget of this tab to the breach page widget
         self.w.resize(900, 600) #width, height
         self.w.currentChanged.connect( self.on_tab_change )
+        self.breach_page.monitor.findings.connect( lambda count: self.w.set_badge( 1, count ) ) #badge on the breach tab for new findings
         #add to layout
         main_layout.addWidget( self.w )
         # Set the central widget of the Window. Widget will expand
         # to take up all the space in the window by default.
+    #no decrypted passwords, nor strengths keyed by them, are kept while the window is hidden or minimized
+    def hideEvent( self, event ):
+        self.vault.forget_secrets()
+        strength_service().clear()
+        super().hideEvent( event )
+
+    def changeEvent( self, event ):
+        if event.type() == QEvent.WindowStateChange and self.isMinimized():
+            self.vault.forget_secrets()
+            strength_service().clear()
+        super().changeEvent( event )
+
     def on_tab_change( self, index ):
         #refresh the tab
         if index == 0:
-            #refresh tab 1
+            #refresh tab 1 from the vault already in memory
             self.pw_page.refresh()
+        elif index == 1:
+            #the user has seen the breach page, clear its badge
+            self.breach_page.monitor.acknowledge()
 
 def main():
     # Set up hash and cipher
@@ -238,6 +280,11 @@ def main():
     cipher = PasswordCipher()
     
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect( strength_service().clear ) #no password strengths outlive the session
+    try:
+        locale.setlocale(locale.LC_COLLATE, "") #alphabetical order follows the user's language
+    except locale.Error:
+        pass #unknown locale, keep the default ordering
     splash = SplashScreen.SplashScreen()
     splash.show()
 
@@ -255,7 +302,10 @@ def main():
         login = LoginScreen( hash, cipher )
         splash.finish(login)
         if login.exec_() == QDialog.Accepted: #wait for dialog to close
-            window = MainWindow( hash, cipher ) #CREATE main window
+            vault = VaultRepository( cipher, open_storage( STORAGE_BACKEND ) ) #load the vault once now that the key exists
+            app.aboutToQuit.connect( vault.forget_secrets ) #no decrypted passwords outlive the session
+            app.aboutToQuit.connect( vault.close ) #finish any background compaction before exiting
+            window = MainWindow( hash, cipher, vault ) #CREATE main window
             window.resize( 900, 600 ) #width, height
             window.show()
 
@@ -271,7 +321,10 @@ def main():
                                       #MAKE THAT CHANGE
         splash.finish(signup)
         if signup.exec_() == QDialog.Accepted: #wait for dialog to close
-            window = MainWindow( hash, cipher ) #CREATE main window
+            vault = VaultRepository( cipher, open_storage( STORAGE_BACKEND ) ) #load the vault once now that the key exists
+            app.aboutToQuit.connect( vault.forget_secrets ) #no decrypted passwords outlive the session
+            app.aboutToQuit.connect( vault.close ) #finish any background compaction before exiting
+            window = MainWindow( hash, cipher, vault ) #CREATE main window
             window.resize( 900, 600 ) #width, height
             window.show()
 
@@ -0,0 +1,174 @@
+'''
+Artifact: Pic-a-Pass breachcorpus.py
+Description: Offline breach checking against a local, sorted Pwned Passwords SHA-1 dump
+Author(s): Team
+Precondition(s): The "ordered by hash" SHA-1 dump has been downloaded to OFFLINE_CORPUS
+Postcondition(s): None
+Error(s):
+- FileNotFoundError: The corpus file does not exist
+Side effect(s): Writes a small prefix index next to the corpus the first time it is used
+Invariant(s): The corpus is never loaded into memory, it is memory-mapped and searched in place
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Prefix lookups for the breach engine                      |
+| Team         | 10/18/26   | Only skip the lock once the index is loaded               |
+#########################################################################################
+'''
+from array import array # Used for the compact prefix index
+import hashlib # Used for hashing passwords
+import mmap # Used for searching the corpus without reading it
+import os # Used for atomic replace of the index
+import random # Used for generating test corpora
+import threading # Used for opening the corpus once from any thread
+
+OFFLINE_CORPUS = "hibp/pwned-passwords-sha1-ordered-by-hash.txt" # Where the downloaded dump lives
+PREFIX_HEX = 4 # Hex characters of the hash covered by the prefix index (65536 buckets, 512KB on disk)
+HASH_LEN = 40 # Length of a hex SHA-1 hash
+
+# Checks passwords against a memory-mapped corpus of lines like "HASH:COUNT", sorted by hash
+# Same check_password interface as Breach.APIChecker, so the breach page can use either
+class OfflineChecker:
+    def __init__(self, path: str = OFFLINE_CORPUS):
+        '''
+        PATH: Path of the corpus
+        INDEX_PATH: Path of the prefix index, built from the corpus the first time it is needed
+        '''
+        self.PATH = path
+        self.INDEX_PATH = path + ".idx"
+        self._file = None
+        self._map = None # Memory map of the corpus
+        self._index = None # Byte offset of the first line of every hash prefix, plus the file size
+        self._lock = threading.Lock()
+
+    # Hash a password the same way the API expects
+    def _get_sha1_hash(self, password: str) -> str:
+        return hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+
+    # Number of times a password appears in the corpus, 0 if it isn't there
+    def check_password(self, password: str) -> int:
+        return self.check_hash(self._get_sha1_hash(password))
+
+    # Number of times a SHA-1 hash appears in the corpus, 0 if it isn't there
+    def check_hash(self, sha1_hex: str) -> int:
+        self.__open()
+        target = sha1_hex.upper().encode('ascii')
+        bucket = int(target[:PREFIX_HEX], 16)
+        return self.__search(target, self._index[bucket], self._index[bucket + 1])
+
+    # Look up several hashes that share a prefix, same interface as Breach.APIChecker.lookup_prefix
+    # @ret: Dictionary of suffix -> number of data breaches (0 if not breached)
+    def lookup_prefix(self, hash_prefix: str, suffixes) -> dict:
+        return {suffix: self.check_hash(hash_prefix + suffix) for suffix in suffixes}
+
+    # Every suffix and count for a 5 character hash prefix, in the same format as the range API
+    def range_response(self, hash_prefix: str) -> str:
+        self.__open()
+        prefix = hash_prefix.upper().encode('ascii')
+        bucket = int(prefix[:PREFIX_HEX], 16)
+        start = self.__lower_bound(prefix, self._index[bucket], self._index[bucket + 1])
+        lines = []
+        while start < len(self._map) and self._map[start:start + len(prefix)] == prefix:
+            end = self.__line_end(start)
+            lines.append(self._map[start + len(prefix):end].decode('ascii').strip())
+            start = end + 1
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        with self._lock:
+            self._index = None # First, so no other thread takes the map as ready
+            if self._map is not None:
+                self._map.close()
+                self._file.close()
+                self._map = None
+                self._file = None
+
+    # Map the corpus and load (or build) the prefix index, once. The index is built from the map and set last, so
+    # other threads only skip the lock once both are ready
+    def __open(self) -> None:
+        if self._index is not None:
+            return
+        with self._lock:
+            if self._index is not None:
+                return
+            self._file = open(self.PATH, mode='rb') # FileNotFoundError if the dump hasn't been downloaded
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._index = self.__load_index()
+
+    # The index is 65537 offsets. Rebuilt if the corpus changed size since it was written
+    def __load_index(self) -> array:
+        index = array('Q')
+        size = len(self._map)
+        try:
+            with open(self.INDEX_PATH, mode='rb') as file:
+                index.frombytes(file.read())
+            if len(index) == (1 << (4 * PREFIX_HEX)) + 1 and index[-1] == size:
+                return index
+        except (FileNotFoundError, ValueError):
+            pass
+        # One binary search per bucket is far faster than scanning a multi-gigabyte file
+        index = array('Q', (self.__lower_bound(f"{bucket:0{PREFIX_HEX}X}".encode('ascii'), 0, size) for bucket in range(1 << (4 * PREFIX_HEX))))
+        index.append(size)
+        try:
+            tmp_path = self.INDEX_PATH + ".tmp"
+            with open(tmp_path, mode='wb') as file:
+                index.tofile(file)
+            os.replace(tmp_path, self.INDEX_PATH)
+        except OSError: # Read-only location, the index just gets rebuilt next time
+            pass
+        return index
+
+    # Start of the line containing position pos (lines end with \n)
+    def __line_start(self, pos: int, lo: int) -> int:
+        newline = self._map.rfind(b"\n", lo, pos)
+        return newline + 1 if newline != -1 else lo
+
+    # Position of the \n ending the line that starts at pos
+    def __line_end(self, pos: int) -> int:
+        end = self._map.find(b"\n", pos)
+        return end if end != -1 else len(self._map)
+
+    # Binary search for a full hash between byte offsets lo and hi (both at line starts)
+    def __search(self, target: bytes, lo: int, hi: int) -> int:
+        while lo < hi:
+            start = self.__line_start((lo + hi) // 2, lo)
+            end = self.__line_end(start)
+            line_hash = self._map[start:start + HASH_LEN]
+            if line_hash == target:
+                return int(self._map[start + HASH_LEN + 1:end].strip())
+            if line_hash < target:
+                lo = end + 1
+            else:
+                hi = start
+        return 0
+
+    # Offset of the first line whose hash is >= prefix, between lo and hi (both at line starts)
+    def __lower_bound(self, prefix: bytes, lo: int, hi: int) -> int:
+        while lo < hi:
+            start = self.__line_start((lo + hi) // 2, lo)
+            end = self.__line_end(start)
+            if self._map[start:start + len(prefix)] < prefix:
+                lo = end + 1
+            else:
+                hi = start
+        return lo
+
+# Write a small corpus in the Pwned Passwords format, for testing and benchmarks
+# passwords: Dictionary of password -> count that must be in the corpus
+# random_hashes: Number of extra random hashes to add
+# seed: Seed for the random hashes so corpora can be regenerated exactly
+def generate_corpus(path: str, passwords: dict = None, random_hashes: int = 10000, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    entries = {}
+    for _ in range(random_hashes):
+        entries[f"{rng.getrandbits(160):040X}"] = rng.randint(1, 100000)
+    for password, count in (passwords or {}).items():
+        entries[hashlib.sha1(password.encode('utf-8')).hexdigest().upper()] = count
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, mode='w', newline='') as file:
+        file.writelines(f"{sha1}:{count}\r\n" for sha1, count in sorted(entries.items())) # Same line endings as the real dump
+    if os.path.exists(path + ".idx"): # Old index belongs to a different corpus
+        os.remove(path + ".idx")
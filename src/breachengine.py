@@ -0,0 +1,143 @@
+'''
+Artifact: Pic-a-Pass breachengine.py
+Description: Concurrent breach checking with bounded parallelism and rate limiting
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s):
+- ConnectionError: A lookup failed after all of its retries (reported per password, not raised)
+Side effect(s): Makes network requests through the checker it is given
+Invariant(s): Never more than max_workers lookups in flight, never faster than the rate limit
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Group lookups by hash prefix                              |
+| Team         | 10/18/26   | Pause and cancel                                          |
+| Team         | 10/18/26   | Size the checker's range cache to the scan                |
+#########################################################################################
+'''
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED # Used for running lookups in parallel
+import hashlib # Used for hashing passwords before grouping them
+import threading # Used for the rate limiter lock
+import time # Used for the rate limiter clock
+
+# Token bucket shared by every worker. acquire() blocks until a request is allowed
+class RateLimiter:
+    def __init__(self, rate: float, burst: int = 1):
+        '''
+        rate: Requests allowed per second (0 or less disables the limit)
+        burst: Requests that can go out back to back after a quiet period
+        '''
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    # Wait for a token
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+# Checks many passwords at once on a thread pool. Passwords are hashed first and grouped by
+# hash prefix so each distinct prefix is looked up exactly once, no matter how many entries
+# share it or reuse the same password. Lookups are handed to the pool a few at a time so a
+# scan can be paused or cancelled part way
+class BreachEngine:
+    def __init__(self, checker, max_workers: int = 8):
+        '''
+        checker: APIChecker or OfflineChecker, anything with lookup_prefix(prefix, suffixes)
+        max_workers: Maximum number of lookups in flight
+        '''
+        self.checker = checker
+        self.max_workers = max_workers
+        self._cancelled = threading.Event()
+        self._running = threading.Event() # Cleared while paused
+        self._running.set()
+
+    # Stop starting new lookups. Lookups already in flight still finish and are yielded
+    def cancel(self) -> None:
+        self._cancelled.set()
+        self._running.set() # Wake a paused scan so it can stop
+
+    # Hold new lookups until resume() is called
+    def pause(self) -> None:
+        self._running.clear()
+
+    def resume(self) -> None:
+        self._running.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def is_paused(self) -> bool:
+        return not self._running.is_set()
+
+    # Check every password, yielding results as each prefix finishes (not in input order)
+    # passwords: List of plaintext passwords
+    # @ret: Generator of (position in passwords, breach count or None, error message or None)
+    def check(self, passwords: list):
+        groups = group_by_prefix(passwords)
+        fit = getattr(self.checker, "fit_cache", None)
+        if fit is not None: # Make room for every range this scan reads, so the next scan finds them all
+            fit(len(groups))
+        pending = iter(groups.items())
+        window = self.max_workers * 2 # Enough queued to keep every worker busy
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            # Top the pool back up, blocking here while paused
+            def submit_more():
+                while len(futures) < window:
+                    if not futures: # Nothing left in flight, wait out a pause here
+                        self._running.wait()
+                    elif not self._running.is_set(): # Paused, let the lookups in flight finish first
+                        return
+                    if self._cancelled.is_set():
+                        return
+                    prefix, suffixes = next(pending, (None, None))
+                    if prefix is None:
+                        return
+                    futures[pool.submit(self.checker.lookup_prefix, prefix, list(suffixes))] = prefix
+            while True:
+                submit_more()
+                if not futures: # Everything looked up, or cancelled
+                    break
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    suffixes = groups[futures.pop(future)]
+                    try:
+                        counts = future.result()
+                    except Exception as e: # Every entry under this prefix failed together
+                        for positions in suffixes.values():
+                            for i in positions:
+                                yield i, None, str(e)
+                        continue
+                    for suffix, positions in suffixes.items(): # Fan the result back out to every entry
+                        for i in positions:
+                            yield i, counts[suffix], None
+
+# SHA-1 every password and group them by the 5 character prefix the range api uses
+# @ret: Dictionary of prefix -> {suffix: [positions in passwords]}
+def group_by_prefix(passwords: list) -> dict:
+    groups = {}
+    hashed = {} # Identical passwords are only hashed once
+    for i, password in enumerate(passwords):
+        sha1 = hashed.get(password)
+        if sha1 is None:
+            sha1 = hashlib.sha1(password.encode('utf-8')).hexdigest().upper()
+            hashed[password] = sha1
+        groups.setdefault(sha1[:5], {}).setdefault(sha1[5:], []).append(i)
+    return groups
@@ -0,0 +1,104 @@
+'''
+Artifact: Pic-a-Pass breachstate.py
+Description: Remembers the result of the last breach check of every entry so scans only redo what changed
+Author(s): Team
+Precondition(s): The cipher has a key (the user is logged in)
+Postcondition(s): None
+Error(s): None, a missing or damaged state file just means every entry gets checked again
+Side effect(s): Writes the state file when saved
+Invariant(s): Passwords are never written, only a fingerprint keyed from the vault key
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+#########################################################################################
+'''
+import csv # Used for reading and writing the state file
+import hashlib # Used for the fingerprint hash function
+import hmac # Used for keyed fingerprints of passwords
+import os # Used for atomic replace of the state file
+import time # Used for the time of each check
+
+BREACH_STATE = "breachstate.csv" # Where the state is kept
+BREACH_STATE_TTL = 7 * 24 * 3600 # Seconds before an unchanged entry is checked again
+
+# Last check of one entry
+class EntryState:
+    def __init__(self, nonce: str, fingerprint: str, checked_at: float, count: int):
+        '''
+        nonce: Nonce of the entry's ciphertext when it was checked, a new nonce means it was re-encrypted
+        fingerprint: Keyed hash of the password that was checked
+        checked_at: Time of the check
+        count: Number of data breaches found
+        '''
+        self.nonce = nonce
+        self.fingerprint = fingerprint
+        self.checked_at = checked_at
+        self.count = count
+
+# Record id -> EntryState, loaded from and saved to a csv file
+class BreachStateStore:
+    def __init__(self, cipher, path: str = BREACH_STATE, ttl: float = BREACH_STATE_TTL):
+        '''
+        cipher: PasswordCipher of the vault, its key is used to key the fingerprints
+        PATH: Path of the state file
+        ttl: Seconds a result is trusted before the entry is checked again
+        '''
+        self.cipher = cipher
+        self.PATH = path
+        self.ttl = ttl
+        self.entries = {}
+        self._key = None # Fingerprint key, derived from the vault key on first use
+        self._key_source = None # Vault key the fingerprint key was derived from
+
+    # Read the state file, replacing anything in memory
+    def load(self) -> None:
+        self.entries = {}
+        try:
+            with open(self.PATH, mode='r', newline='') as file:
+                for row in csv.reader(file):
+                    try:
+                        record_id, nonce, fingerprint, checked_at, count = row
+                        self.entries[record_id] = EntryState(nonce, fingerprint, float(checked_at), int(count))
+                    except ValueError: # Skip damaged rows, those entries are checked again
+                        continue
+        except FileNotFoundError:
+            pass
+
+    # Write the state file. Written to a temp file first so a crash never leaves a half written file
+    def save(self) -> None:
+        tmp_path = self.PATH + ".tmp"
+        with open(tmp_path, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerows([record_id, state.nonce, state.fingerprint, state.checked_at, state.count] for record_id, state in self.entries.items())
+        os.replace(tmp_path, self.PATH)
+
+    # @ret: EntryState of a record, or None if it has never been checked
+    def get(self, record_id: str):
+        return self.entries.get(record_id)
+
+    # Whether a result is recent enough to be reused
+    def is_fresh(self, state) -> bool:
+        return state is not None and time.time() - state.checked_at < self.ttl
+
+    # Keyed fingerprint of a password. Without the vault key it can't be used to guess the password
+    def fingerprint(self, password: str) -> str:
+        return hmac.new(self.__fingerprint_key(), password.encode('utf-8'), hashlib.sha256).hexdigest()
+
+    # Remember the result of checking a record
+    def set(self, record_id: str, nonce: str, fingerprint: str, count: int, checked_at: float = None) -> None:
+        self.entries[record_id] = EntryState(nonce, fingerprint, time.time() if checked_at is None else checked_at, count)
+
+    # Forget records that are no longer in the vault
+    def prune(self, record_ids) -> None:
+        live = set(record_ids)
+        self.entries = {record_id: state for record_id, state in self.entries.items() if record_id in live}
+
+    # Separate key for fingerprints so the vault key itself is never used for anything but encryption
+    def __fingerprint_key(self) -> bytes:
+        if self._key is None or self._key_source != self.cipher.key:
+            self._key = hmac.new(self.cipher.key, b"pic-a-pass breach fingerprint", hashlib.sha256).digest()
+            self._key_source = self.cipher.key
+        return self._key
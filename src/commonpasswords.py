@@ -0,0 +1,235 @@
+'''
+Artifact: Pic-a-Pass commonpasswords.py
+Description: Membership tests against large common password lists (millions of entries) with a fixed memory ceiling
+Author(s): Team
+Precondition(s): Lists have been prepared into DICTIONARY_DIR, e.g. python3 commonpasswords.py bloom rockyou.txt
+Postcondition(s): None
+Error(s):
+- ValueError: A .bloom file is damaged or from another program
+Side effect(s): Memory-maps the prepared lists the first time a password is checked
+Invariant(s): Lists are never read into Python objects, memory use is bounded by the prepared file sizes
+Known fault(s): Bloom filters have false positives (about 1 in 1000 at the default size), never false negatives
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Batch checks for the vault audit                          |
+#########################################################################################
+'''
+import hashlib # Used for the Bloom filter hash functions
+import math # Used for sizing Bloom filters
+import mmap # Used for checking lists without reading them
+import os # Used for finding the prepared lists and atomic replace
+import struct # Used for the Bloom filter file header
+import sys # Used for the command line
+import threading # Used for loading the lists once from any thread
+
+DICTIONARY_DIR = "dictionaries" # Prepared lists, *.bloom and *.sorted
+BLOOM_MAX_BYTES = 32 * 1024 * 1024 # Largest Bloom filter built, whatever the list size
+BLOOM_ERROR_RATE = 0.001 # Target false positive rate when the ceiling allows it
+BLOOM_MAGIC = b"PAPBLOOM"
+BLOOM_HEADER = struct.Struct("<8sIQIQ") # Magic, version, number of bits, number of hashes, number of entries
+
+# Common password list stored as a Bloom filter file, memory-mapped
+class BloomDictionary:
+    def __init__(self, path: str):
+        '''
+        PATH: Path of the .bloom file
+        bits: Size of the filter in bits
+        hashes: Number of bits set per password
+        '''
+        self.PATH = path
+        self._file = open(path, mode='rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.bits, self.hashes, self.count = BLOOM_HEADER.unpack_from(self._map, 0)
+        if magic != BLOOM_MAGIC or version != 1 or len(self._map) < BLOOM_HEADER.size + (self.bits + 7) // 8:
+            self.close()
+            raise ValueError(f"{path} is not a Pic-a-Pass Bloom filter")
+
+    def __contains__(self, password: str) -> bool:
+        offset = BLOOM_HEADER.size
+        for bit in bloom_positions(password, self.bits, self.hashes):
+            if not self._map[offset + (bit >> 3)] & (1 << (bit & 7)):
+                return False
+        return True
+
+    # Check many passwords at once, the bit tests are done by NumPy
+    # @ret: Boolean array, True where the password is (probably) in the list
+    def contains_many(self, passwords: list):
+        import numpy as np # Only needed for batch checks (vault audit)
+        bits = np.frombuffer(self._map, dtype=np.uint8, count=(self.bits + 7) // 8, offset=BLOOM_HEADER.size)
+        h1 = np.empty(len(passwords), dtype=np.uint64)
+        h2 = np.empty(len(passwords), dtype=np.uint64)
+        for i, password in enumerate(passwords):
+            digest = hashlib.blake2b(password.encode('utf-8'), digest_size=16).digest()
+            h1[i] = int.from_bytes(digest[:8], 'little') % self.bits
+            h2[i] = (int.from_bytes(digest[8:], 'little') | 1) % self.bits
+        found = np.ones(len(passwords), dtype=bool)
+        for i in range(self.hashes): # (h1 + i * h2) % bits, reduced first so nothing overflows 64 bits
+            bit = (h1 + np.uint64(i) * h2) % np.uint64(self.bits)
+            found &= (bits[bit >> np.uint64(3)] >> (bit & np.uint64(7)).astype(np.uint8)) & 1 == 1
+        del bits # Release the buffer so the map can be closed
+        return found
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+# Common password list stored as a sorted text file (one password per line, sorted by bytes), memory-mapped
+class SortedFileDictionary:
+    def __init__(self, path: str):
+        '''
+        PATH: Path of the sorted list
+        '''
+        self.PATH = path
+        self._file = open(path, mode='rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(path) else b""
+
+    # Binary search over line starts, O(log n) page reads
+    def __contains__(self, password: str) -> bool:
+        target = password.encode('utf-8')
+        lo, hi = 0, len(self._map)
+        while lo < hi:
+            newline = self._map.rfind(b"\n", lo, (lo + hi) // 2)
+            start = newline + 1 if newline != -1 else lo # Start of the line holding the midpoint
+            end = self._map.find(b"\n", start)
+            end = len(self._map) if end == -1 else end
+            line = self._map[start:end].rstrip(b"\r")
+            if line == target:
+                return True
+            if line < target:
+                lo = end + 1
+            else:
+                hi = start
+        return False
+
+    def close(self) -> None:
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+# Every prepared list in a directory, opened the first time a password is checked
+class CommonPasswordDictionary:
+    def __init__(self, directory: str = DICTIONARY_DIR):
+        '''
+        DIRECTORY: Folder holding the prepared lists
+        lists: Opened BloomDictionary and SortedFileDictionary objects, None until first use
+        '''
+        self.DIRECTORY = directory
+        self.lists = None
+        self._lock = threading.Lock()
+
+    def __contains__(self, password: str) -> bool:
+        return any(password in dictionary for dictionary in self.__open())
+
+    # Check many passwords at once. Bloom filters are checked in bulk, sorted lists one at a time
+    # @ret: Boolean array, True where the password is in any list
+    def contains_many(self, passwords: list):
+        import numpy as np # Only needed for batch checks (vault audit)
+        found = np.zeros(len(passwords), dtype=bool)
+        for dictionary in self.__open():
+            if hasattr(dictionary, "contains_many"):
+                found |= dictionary.contains_many(passwords)
+            else:
+                found |= np.fromiter((password in dictionary for password in passwords), dtype=bool, count=len(passwords))
+        return found
+
+    # Close the lists, they are opened again if needed
+    def close(self) -> None:
+        with self._lock:
+            for dictionary in self.lists or []:
+                dictionary.close()
+            self.lists = None
+
+    def __open(self) -> list:
+        if self.lists is not None:
+            return self.lists
+        with self._lock:
+            if self.lists is None:
+                lists = []
+                try:
+                    names = sorted(os.listdir(self.DIRECTORY))
+                except FileNotFoundError: # Nothing prepared, only the built in top 500 is used
+                    names = []
+                for name in names:
+                    path = os.path.join(self.DIRECTORY, name)
+                    try:
+                        if name.endswith(".bloom"):
+                            lists.append(BloomDictionary(path))
+                        elif name.endswith(".sorted"):
+                            lists.append(SortedFileDictionary(path))
+                    except (OSError, ValueError): # Skip a list that can't be used rather than fail every check
+                        continue
+                self.lists = lists
+        return self.lists
+
+# Bit positions of a password in a Bloom filter, double hashing over one BLAKE2b digest
+def bloom_positions(password: str, bits: int, hashes: int):
+    digest = hashlib.blake2b(password.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1 # Odd, so every position is reachable
+    for i in range(hashes):
+        yield (h1 + i * h2) % bits
+
+# Bits and hash count for n entries, capped at max_bytes
+# @ret: (bits, hashes)
+def bloom_size(n: int, error_rate: float = BLOOM_ERROR_RATE, max_bytes: int = BLOOM_MAX_BYTES) -> tuple:
+    n = max(n, 1)
+    bits = math.ceil(-n * math.log(error_rate) / (math.log(2) ** 2))
+    bits = max(64, min(bits, max_bytes * 8))
+    hashes = max(1, min(round(bits / n * math.log(2)), math.ceil(-math.log2(error_rate)))) # More hashes than the error rate needs only costs time
+    return bits, hashes
+
+# Build a Bloom filter file from a password list (one per line, any order). Memory use is the filter size
+def build_bloom(list_path: str, bloom_path: str, error_rate: float = BLOOM_ERROR_RATE, max_bytes: int = BLOOM_MAX_BYTES) -> None:
+    with open(list_path, mode='rb') as file:
+        n = sum(1 for _ in file)
+    bits, hashes = bloom_size(n, error_rate, max_bytes)
+    array = bytearray((bits + 7) // 8)
+    count = 0
+    with open(list_path, mode='rb') as file:
+        for line in file:
+            password = line.rstrip(b"\r\n").decode('utf-8', errors='replace')
+            if not password:
+                continue
+            for bit in bloom_positions(password, bits, hashes):
+                array[bit >> 3] |= 1 << (bit & 7)
+            count += 1
+    os.makedirs(os.path.dirname(bloom_path) or ".", exist_ok=True)
+    tmp_path = bloom_path + ".tmp"
+    with open(tmp_path, mode='wb') as file:
+        file.write(BLOOM_HEADER.pack(BLOOM_MAGIC, 1, bits, hashes, count))
+        file.write(array)
+    os.replace(tmp_path, bloom_path)
+
+# Write a password list sorted by bytes with duplicates removed, for SortedFileDictionary.
+# The list is sorted in memory, so this is for lists that fit; use build_bloom for bigger ones
+def build_sorted(list_path: str, sorted_path: str) -> None:
+    with open(list_path, mode='rb') as file:
+        passwords = sorted({line.rstrip(b"\r\n") for line in file} - {b""})
+    os.makedirs(os.path.dirname(sorted_path) or ".", exist_ok=True)
+    tmp_path = sorted_path + ".tmp"
+    with open(tmp_path, mode='wb') as file:
+        file.write(b"\n".join(passwords))
+    os.replace(tmp_path, sorted_path)
+
+_default = None # Shared dictionary over DICTIONARY_DIR
+
+# Dictionary used by password_strength, opened lazily on the first check
+def default_dictionary() -> CommonPasswordDictionary:
+    global _default
+    if _default is None:
+        _default = CommonPasswordDictionary()
+    return _default
+
+# Prepare a list: python3 commonpasswords.py bloom|sorted LIST [NAME]
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("bloom", "sorted"):
+        print("usage: python3 commonpasswords.py bloom|sorted LIST [NAME]")
+        sys.exit(1)
+    kind, list_path = sys.argv[1], sys.argv[2]
+    name = sys.argv[3] if len(sys.argv) > 3 else os.path.splitext(os.path.basename(list_path))[0]
+    out_path = os.path.join(DICTIONARY_DIR, f"{name}.{kind}")
+    (build_bloom if kind == "bloom" else build_sorted)(list_path, out_path)
+    print(f"Wrote {out_path} ({os.path.getsize(out_path):,} bytes)")
@@ -21,6 +21,7 @@ Known fault(s): None
 | Ben Schulte  | 11/24/24   | Updated functions to output base64 encoded data to files  |
 | Ben Schulte  | 12/3/24    | Added functions for doing steganography                   |
 | Ben Schulte  | 12/8/24    | Added final comments to the document                      |
+| Team         | 10/18/26   | Reused cipher context and bulk encrypt/decrypt functions  |
 #########################################################################################
 '''
 
@@ -30,7 +31,9 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes # U
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM # Algorithm used for encrypting passwords
 from cryptography.hazmat.primitives.kdf import KeyDerivationFunction # Needed for PBKDF2HMAC
 from pathlib import Path # Used for checking if paths exist
-from typing import Tuple # Used for returning tuples
+from typing import Tuple, Iterable, Iterator, List, Union # Used for type hints
+from concurrent.futures import ThreadPoolExecutor # Used for spreading batch encryption/decryption over threads
+from functools import partial # Used for handing the cipher context to the batch workers
 from PIL import Image # Used for handling image files for steg
 import stepic # Used for steg functions
 import base64 # Used for base64 encoding/decoding
@@ -113,16 +116,22 @@ class PasswordCipher:
     ALG: Algorithm to use for PBKDF2
     KEYLEN: Length of the key generated from PBKDF2
     ITR: Number of iterations to do for PBKDF2
+    BATCH_CHUNK: Number of items each worker handles at a time in the bulk functions
+    MAX_WORKERS: Maximum number of threads used by the bulk functions
     '''
     def __init__(self):
         self.salt = None
         self.key = None
+        self._aesgcm = None # Cipher context, reused for as long as the key doesn't change
+        self._aesgcm_key = None # Key the cipher context was made with
 
         self.TMP_IMG = "img/.tmp.png"
         self.PATH = "img/encryptionkey.png"
         self.ALG = SHA256()
         self.KEYLEN = 32
         self.ITR = 100000
+        self.BATCH_CHUNK = 256
+        self.MAX_WORKERS = min(8, os.cpu_count() or 1)
 
     # Use PBKDF2 to generate a key from a given password
     # pwd: The password used to generate the symmetric key
@@ -153,11 +162,7 @@ class PasswordCipher:
     def encrypt(self, pt: str, aad: bytes = b"") -> Tuple[bytes, bytes]:
         if (self.key is None): # Check if there is a key for encryption
             raise EmptyKeyError("No key for encryption") # Error if not
-        aesgcm = AESGCM(self.key) # Use key to create the cipherj
-        nonce = os.urandom(12) # Generate a random number (Nonce)
-        ct = base64.b64encode(aesgcm.encrypt(nonce, pt.encode('utf-8'), aad)) # Encrypt with algorithm with generated values and base64 encode it 
-        nonce = base64.b64encode(nonce) # base64 encode the nonce
-        return ct, nonce # Return the ciphertext and the nonce as a tuple
+        return self.__encrypt_one(self.__cipher(), pt, aad)
     
     # Decrypt the given ciphertext using the generated symmetric key, given nonce, and authentication data
     # ct: The ciphertext to decrypt
@@ -167,13 +172,69 @@ class PasswordCipher:
     def decrypt(self, ct: bytes, nonce: bytes, aad: bytes = b"") -> str:
         if (self.key is None): # Check if there is a key for decryption
             raise EmptyKeyError("No key for decryption") # Error if there isn't a key
-        aesgcm = AESGCM(self.key) # Use key to create a cipher
+        return self.__decrypt_one(self.__cipher(), ct, nonce, aad)
+
+    # Encrypt a batch of passwords. Large batches are split over a thread pool
+    # items: Iterable of (plaintext, aad) tuples
+    # stream: Return a generator that yields results as they are ready instead of a list
+    # @ret: (ciphertext, nonce) tuples in the same order as items
+    def encrypt_many(self, items: Iterable[Tuple[str, bytes]], stream: bool = False) -> Union[List[Tuple[bytes, bytes]], Iterator[Tuple[bytes, bytes]]]:
+        if (self.key is None): # Check if there is a key for encryption
+            raise EmptyKeyError("No key for encryption") # Error if not
+        results = self.__run_batch(self.__encrypt_chunk, self.__cipher(), list(items))
+        return results if stream else list(results)
+
+    # Decrypt a batch of passwords. Large batches are split over a thread pool
+    # items: Iterable of (ciphertext, nonce, aad) tuples, encoded the same way decrypt expects
+    # stream: Return a generator that yields results as they are ready instead of a list
+    # @ret: Decrypted passwords in the same order as items
+    def decrypt_many(self, items: Iterable[Tuple[bytes, bytes, bytes]], stream: bool = False) -> Union[List[str], Iterator[str]]:
+        if (self.key is None): # Check if there is a key for decryption
+            raise EmptyKeyError("No key for decryption") # Error if there isn't a key
+        results = self.__run_batch(self.__decrypt_chunk, self.__cipher(), list(items))
+        return results if stream else list(results)
+
+    # Cipher context for the current key. Only rebuilt when the key changes
+    def __cipher(self) -> AESGCM:
+        if self._aesgcm is None or self._aesgcm_key != self.key:
+            self._aesgcm = AESGCM(self.key)
+            self._aesgcm_key = self.key
+        return self._aesgcm
+
+    # Encrypt a single password with the given cipher context
+    def __encrypt_one(self, aesgcm: AESGCM, pt: str, aad: bytes) -> Tuple[bytes, bytes]:
+        nonce = os.urandom(12) # Generate a random number (Nonce)
+        ct = base64.b64encode(aesgcm.encrypt(nonce, pt.encode('utf-8'), aad)) # Encrypt with algorithm with generated values and base64 encode it 
+        nonce = base64.b64encode(nonce) # base64 encode the nonce
+        return ct, nonce # Return the ciphertext and the nonce as a tuple
+
+    # Decrypt a single password with the given cipher context
+    def __decrypt_one(self, aesgcm: AESGCM, ct: bytes, nonce: bytes, aad: bytes) -> str:
         try: 
             pt = aesgcm.decrypt(base64.b64decode(nonce), base64.b64decode(ct), aad) # Try decrypting
         except Exception as e: # Catch exception
             return f"Decryption failed: {e}" # Decryption failed due to file being altered
         return pt.decode('utf-8') # Return the decoded password
 
+    # Worker functions for the bulk api. Every chunk uses the batch's one cipher context, AESGCM is safe to share between threads
+    def __encrypt_chunk(self, aesgcm: AESGCM, chunk: list) -> list:
+        return [self.__encrypt_one(aesgcm, pt, aad) for pt, aad in chunk]
+
+    def __decrypt_chunk(self, aesgcm: AESGCM, chunk: list) -> list:
+        return [self.__decrypt_one(aesgcm, ct, nonce, aad) for ct, nonce, aad in chunk]
+
+    # Split items into chunks and run work on each one with the same cipher context, in order
+    # Small batches run on the calling thread since the pool would only add overhead
+    def __run_batch(self, work, aesgcm: AESGCM, items: list) -> Iterator:
+        chunks = [items[i:i + self.BATCH_CHUNK] for i in range(0, len(items), self.BATCH_CHUNK)]
+        if len(chunks) <= 1 or self.MAX_WORKERS <= 1:
+            for chunk in chunks:
+                yield from work(aesgcm, chunk)
+            return
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(chunks))) as pool: # The AES backend releases the GIL
+            for result in pool.map(partial(work, aesgcm), chunks): # map keeps the results in order
+                yield from result
+
     # Writes the salt to the PBKDF2 data file
     def __write_data(self) -> None:
         if (self.salt is None): # Check if there is a salt to write
@@ -0,0 +1,179 @@
+'''
+Artifact: Pic-a-Pass rangecache.py
+Description: Size bounded on-disk cache of Pwned Passwords range responses, stored as packed binary hashes
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s): None, a cache that can't be read or written behaves like an empty cache
+Side effect(s): Writes one file per hash prefix under the cache directory
+Invariant(s): Entries are only ever replaced whole (os.replace), a reader never sees a partial file
+Known fault(s): The size limit is tracked per process, two apps sharing a directory can overshoot it until the next eviction
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Binary entries and a size limit that fits the whole vault |
+#########################################################################################
+'''
+import os # Used for listing, replacing and removing cache files
+import struct # Used for packing hashes and counts
+import threading # Used for locking the size bookkeeping
+import time # Used for the fetch time of each entry
+
+RANGE_CACHE_DIR = "hibp/range-cache" # Where cached responses live
+RANGE_CACHE_TTL = 7 * 24 * 3600 # Seconds before an entry has to be revalidated with the API
+RANGE_CACHE_MAX_BYTES = 64 * 1024 * 1024 # Least recently used entries are removed past this, unless a scan needs more (see fit)
+RANGE_CACHE_CEILING = 1024 * 1024 * 1024 # Most fit will ever raise the limit to
+RANGE_ENTRY_ESTIMATE = 24 * 1024 # Typical entry size, around 1000 hashes at 22 bytes each
+RANGE_MAGIC = "PAPRANGE1" # Start of every entry, older text entries are treated as misses
+RANGE_RECORD = struct.Struct(">18sI") # Hash suffix (35 hex digits, zero padded to 18 bytes), breach count
+
+# One file per 5 character prefix. The first line holds the fetch time and ETag, the rest is one
+# 22 byte record per hash, about half the size of the text response. Padding entries (count 0) aren't kept.
+# File modification time is the last use, so the oldest files are evicted first
+class RangeCache:
+    def __init__(self, directory: str = RANGE_CACHE_DIR, ttl: float = RANGE_CACHE_TTL, max_bytes: int = RANGE_CACHE_MAX_BYTES):
+        '''
+        DIRECTORY: Folder holding the cache files, created on first write
+        ttl: Seconds an entry is served without asking the API
+        max_bytes: Total size the cache is trimmed back to
+        '''
+        self.DIRECTORY = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._size = None # Total bytes on disk, counted on first write
+        self._lock = threading.Lock()
+
+    # Cached entry for a prefix
+    # @ret: (body, etag, fetched_at) or None if there is no readable entry
+    def load(self, hash_prefix: str):
+        path = self.__path(hash_prefix)
+        try:
+            with open(path, mode='rb') as file:
+                header = file.readline().decode('utf-8').rstrip("\n")
+                data = file.read()
+            magic, fetched_at, etag = header.split("\t", 2)
+            if magic != RANGE_MAGIC:
+                return None
+            fetched_at = float(fetched_at)
+            body = unpack_range(data)
+        except (OSError, ValueError, struct.error): # Missing or unreadable entry is just a miss
+            return None
+        try:
+            os.utime(path) # Mark as recently used for eviction
+        except OSError:
+            pass
+        return body, etag or None, fetched_at
+
+    # Whether an entry fetched at fetched_at can be used without revalidating
+    def is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl
+
+    # Write or replace the entry for a prefix, fetched now
+    def store(self, hash_prefix: str, body: str, etag: str = None) -> None:
+        path = self.__path(hash_prefix)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp" # Unique per writer so concurrent scans don't share a temp file
+        try:
+            data = f"{RANGE_MAGIC}\t{time.time()}\t{etag or ''}\n".encode('utf-8') + pack_range(body)
+        except ValueError: # Not a range response, don't keep it
+            return
+        try:
+            os.makedirs(self.DIRECTORY, exist_ok=True)
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            with open(tmp_path, mode='wb') as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except OSError: # Read-only location or full disk, the response is still used, just not kept
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self.__disk_size()
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self.__evict()
+
+    # Raise the size limit so a scan over this many distinct prefixes fits, otherwise a scan
+    # bigger than the cache evicts every entry before the next scan can use it
+    # prefixes: Number of distinct hash prefixes the scan looks up
+    def fit(self, prefixes: int) -> None:
+        with self._lock:
+            needed = min(RANGE_CACHE_CEILING, prefixes * RANGE_ENTRY_ESTIMATE * 5 // 4) # A quarter spare for entries bigger than typical
+            self.max_bytes = max(self.max_bytes, needed)
+
+    # Remove every entry
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self.__entries():
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def __path(self, hash_prefix: str) -> str:
+        return os.path.join(self.DIRECTORY, hash_prefix.upper())
+
+    # Cache files in the directory, skipping temp files of writes in progress
+    def __entries(self) -> list:
+        try:
+            with os.scandir(self.DIRECTORY) as entries:
+                return [entry for entry in entries if entry.is_file() and not entry.name.endswith(".tmp")]
+        except OSError:
+            return []
+
+    def __disk_size(self) -> int:
+        size = 0
+        for entry in self.__entries():
+            try:
+                size += entry.stat().st_size
+            except OSError: # Removed by another process in the meantime
+                pass
+        return size
+
+    # Remove least recently used entries until the cache is back under three quarters of the limit
+    # so eviction doesn't run again on the very next write
+    def __evict(self) -> None:
+        stats = []
+        for entry in self.__entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            stats.append((stat.st_mtime, stat.st_size, entry.path))
+        stats.sort()
+        size = sum(size for _, size, _ in stats)
+        target = self.max_bytes * 3 // 4
+        for _, file_size, path in stats:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            size -= file_size
+        self._size = size
+
+# Pack a range response (SUFFIX:COUNT lines) into binary records
+def pack_range(body: str) -> bytes:
+    records = []
+    for line in body.splitlines():
+        if not line:
+            continue
+        suffix, count = line.split(":")
+        count = int(count)
+        if count > 0: # Padding entries never match a real hash
+            records.append(RANGE_RECORD.pack(bytes.fromhex("0" + suffix), min(count, 0xFFFFFFFF)))
+    return b"".join(records)
+
+# Turn binary records back into a range response
+def unpack_range(data: bytes) -> str:
+    return "\r\n".join(f"{suffix.hex()[1:].upper()}:{count}" for suffix, count in RANGE_RECORD.iter_unpack(data))
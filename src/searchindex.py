@@ -0,0 +1,155 @@
+'''
+Artifact: Pic-a-Pass searchindex.py
+Description: Trigram search index over the website, username and notes of every record
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s): None
+Side effect(s): None
+Invariant(s): Every live document in the index matches a record in the vault
+Known fault(s): Queries shorter than 3 characters that can't narrow a previous result scan every document
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Cancellable fuzzy search                                  |
+#########################################################################################
+'''
+import threading # Used for locking the index so it can be searched from another thread
+
+GRAM = 3 # Length of the n-grams in the posting lists
+FIELD_MARK = "\x01" # Marks the start and end of a field so fuzzy search can match short words
+
+# Inverted index of lowercased trigrams. Each posting list holds document numbers in the order they were added
+class SearchIndex:
+    def __init__(self):
+        '''
+        postings: Trigram -> list of document numbers that contain it
+        texts: Document number -> searchable text, None once the document is removed
+        grams: Document number -> number of distinct trigrams, used to score fuzzy matches
+        doc_of: Record id -> its current document number
+        record_of: Document number -> record id
+        '''
+        self.postings = {}
+        self.texts = []
+        self.grams = []
+        self.doc_of = {}
+        self.record_of = []
+        self._dead = 0 # Removed documents still referenced by the posting lists
+        self._last_query = None # Last exact query, used to narrow the next one
+        self._last_result = None # Document numbers that matched the last exact query
+        self._lock = threading.RLock()
+
+    # Add or replace the searchable fields of a record
+    def add(self, record) -> None:
+        with self._lock:
+            self.__remove(record.id)
+            fields = [record.website.lower(), record.username.lower(), record.notes.lower()]
+            doc = len(self.texts)
+            grams = set()
+            for field in fields:
+                marked = FIELD_MARK + field + FIELD_MARK
+                grams.update(marked[i:i + GRAM] for i in range(len(marked) - GRAM + 1))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(doc)
+            self.texts.append("\n".join(fields)) # Newlines keep a query from matching across two fields
+            self.grams.append(len(grams))
+            self.record_of.append(record.id)
+            self.doc_of[record.id] = doc
+            self._last_query = None # Cached result doesn't know about the new document
+
+    # Remove a record from the index
+    def remove(self, record_id) -> None:
+        with self._lock:
+            self.__remove(record_id)
+            if self._dead > len(self.doc_of) and self._dead > 1024: # Mostly dead, rebuild the posting lists
+                self.__rebuild()
+
+    # Record ids whose website, username or notes contain the query (case insensitive)
+    # @ret: Set of record ids, or None if the query is empty and everything matches
+    def search(self, query: str):
+        query = query.lower()
+        if not query:
+            return None
+        with self._lock:
+            if self._last_query is not None and self._last_query in query: # Typing more narrows the last result
+                candidates = self._last_result
+            elif len(query) >= GRAM:
+                candidates = self.__candidates(query)
+            else: # Too short for the trigrams, check every document
+                candidates = range(len(self.texts))
+            texts = self.texts
+            result = [doc for doc in candidates if texts[doc] is not None and query in texts[doc]]
+            self._last_query, self._last_result = query, result
+            return {self.record_of[doc] for doc in result}
+
+    # Typo tolerant search ranked by how many trigrams the query shares with each record
+    # limit: Maximum number of results
+    # threshold: Minimum similarity (0 to 1) for a record to be returned
+    # cancelled: Optional function that returns True once the caller no longer wants the result
+    # @ret: Record ids, best match first
+    def fuzzy(self, query: str, limit: int = 50, threshold: float = 0.3, cancelled=None) -> list:
+        query = query.lower()
+        marked = FIELD_MARK + query + FIELD_MARK
+        grams = {marked[i:i + GRAM] for i in range(len(marked) - GRAM + 1)}
+        if not grams:
+            return []
+        with self._lock:
+            shared = {}
+            for gram in grams:
+                if cancelled is not None and cancelled(): # Stop early, nobody is waiting for this
+                    return []
+                for doc in self.postings.get(gram, ()):
+                    shared[doc] = shared.get(doc, 0) + 1
+            scored = []
+            for doc, count in shared.items():
+                if self.texts[doc] is None:
+                    continue
+                # Dice coefficient, but only against as many of the record's trigrams as the query has
+                # so long notes don't drown out a good match on the website
+                score = 2 * count / (len(grams) + min(self.grams[doc], len(grams)))
+                if query in self.texts[doc]: # Exact matches always come first
+                    score += 1
+                if score >= threshold:
+                    scored.append((score, doc))
+            scored.sort(key=lambda x: x[0], reverse=True)
+            return [self.record_of[doc] for _, doc in scored[:limit]]
+
+    # Rarest posting list of the query's trigrams. Every match has to be in it
+    def __candidates(self, query: str) -> list:
+        best = None
+        for i in range(len(query) - GRAM + 1):
+            posting = self.postings.get(query[i:i + GRAM])
+            if posting is None: # A trigram nobody has, nothing can match
+                return []
+            if best is None or len(posting) < len(best):
+                best = posting
+        return best
+
+    def __remove(self, record_id) -> None:
+        doc = self.doc_of.pop(record_id, None)
+        if doc is not None:
+            self.texts[doc] = None # Posting lists are cleaned up lazily by __rebuild
+            self._dead += 1
+            self._last_query = None
+
+    # Drop removed documents from the posting lists and renumber the live ones
+    def __rebuild(self) -> None:
+        renumber = {}
+        texts, grams, record_of = [], [], []
+        for doc, text in enumerate(self.texts):
+            if text is not None:
+                renumber[doc] = len(texts)
+                texts.append(text)
+                grams.append(self.grams[doc])
+                record_of.append(self.record_of[doc])
+        postings = {}
+        for gram, docs in self.postings.items():
+            live = [renumber[doc] for doc in docs if doc in renumber]
+            if live:
+                postings[gram] = live
+        self.postings, self.texts, self.grams, self.record_of = postings, texts, grams, record_of
+        self.doc_of = {record_id: doc for doc, record_id in enumerate(record_of)}
+        self._dead = 0
+        self._last_query = None
@@ -0,0 +1,127 @@
+'''
+Artifact: Pic-a-Pass sequencematcher.py
+Description: Aho-Corasick automaton that finds every alphabet, digit and keyboard run in a password in one pass
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s): None
+Side effect(s): None
+Invariant(s): Matching time depends on the password length only, not on how many patterns or layouts there are
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+#########################################################################################
+'''
+
+# Letter rows of common keyboard layouts, lowercase and left to right.
+# Add a layout here and pass its name to password_strength.find_sequential_chars to penalize its runs
+KEYBOARD_LAYOUTS = {
+    "qwerty": ["qwertyuiop", "asdfghjkl", "zxcvbnm"],
+    "azerty": ["azertyuiop", "qsdfghjklm", "wxcvbn"],
+    "qwertz": ["qwertzuiop", "asdfghjkl", "yxcvbnm"],
+    "dvorak": ["',.pyfgcrl", "aoeuidhtns", ";qjkxbmwvz"],
+}
+
+# Multi-pattern string matcher. Patterns are compiled into a trie with failure links once,
+# then any text is scanned in a single pass
+class AhoCorasick:
+    def __init__(self, patterns):
+        '''
+        patterns: Strings to find, the position of each in this list is its pattern number
+        goto: State -> {character: next state}, the trie
+        fail: State -> longest proper suffix state that is also in the trie
+        output: State -> pattern numbers that end at this state, including through failure links
+        '''
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [()]
+        for number, pattern in enumerate(self.patterns):
+            self.__add(pattern, number)
+        self.__link()
+
+    # Follow one character from a state
+    # @ret: The next state
+    def step(self, state: int, char: str) -> int:
+        goto, fail = self.goto, self.fail
+        while state and char not in goto[state]:
+            state = fail[state]
+        return goto[state].get(char, 0)
+
+    # Pattern numbers of every pattern that occurs in text
+    def find_all(self, text: str) -> set:
+        found = set()
+        state = 0
+        output = self.output
+        for char in text:
+            state = self.step(state, char)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def __add(self, pattern: str, number: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(())
+            state = next_state
+        self.output[state] = self.output[state] + (number,)
+
+    # Breadth first so every failure link points at a state that is already linked
+    def __link(self) -> None:
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+# Penalty for runs taken from a list of sequences. Every window of min_len to max_len characters
+# of every sequence is a pattern; a window found in the password costs 0.93 ** its length,
+# once for each place it appears in the sequences
+class SequenceMatcher:
+    def __init__(self, sequences, min_len: int = 3, max_len: int = 6):
+        '''
+        sequences: Strings whose runs are penalized, matched case insensitively
+        hits: Pattern number -> (order, length) of every window that produced it, order being the
+              position the window was tested in by the original nested loops
+        '''
+        self.sequences = list(sequences)
+        windows = {} # Lowercase window -> its hits
+        order = 0
+        for length in range(min_len, max_len + 1):
+            for sequence in self.sequences:
+                for i in range(len(sequence) - length + 1):
+                    windows.setdefault(sequence[i:i + length].lower(), []).append((order, length))
+                    order += 1
+        self.automaton = AhoCorasick(windows)
+        self.hits = list(windows.values())
+
+    # Pattern numbers of the runs in a password, case insensitive
+    def find(self, password: str) -> set:
+        return self.automaton.find_all(password.lower())
+
+    # Multiplier between 0.1 and 1 for the entropy of a password, 1 when it has no runs
+    def penalty(self, password: str) -> float:
+        return self.penalty_for(self.find(password), len(password))
+
+    # Penalty for runs already found, e.g. by feeding the automaton one character at a time
+    # found: Pattern numbers
+    # length: Length of the password, runs longer than it are ignored like the original loops did
+    def penalty_for(self, found, length: int) -> float:
+        hits = sorted(hit for number in found for hit in self.hits[number] if hit[1] <= length)
+        penalty = 1.0
+        for _, run_length in hits: # Same order as the original loops, so the float result is identical
+            penalty *= 0.93 ** run_length
+        return max(0.1, penalty) # Never reduce entropy by more than 90%
@@ -0,0 +1,71 @@
+'''
+Artifact: Pic-a-Pass sortindex.py
+Description: Sorted indexes of the vault kept up to date as records change
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s): None
+Side effect(s): None
+Invariant(s): Each index always holds every record of the vault in sorted order
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+#########################################################################################
+'''
+import bisect # Used for keeping the index sorted on insert
+import locale # Used for locale aware alphabetical ordering
+
+# Alphabetical sort key. Case is folded and the locale's collation rules are applied,
+# the original text and id break ties so every key is unique
+def website_key(record) -> tuple:
+    return (locale.strxfrm(record.website.casefold()), record.website, record.id)
+
+# Last updated sort key
+def timestamp_key(record) -> tuple:
+    return (record.timestamp, record.id)
+
+# A list of (key, record id) kept in sorted order. Keys are computed once per change, not per sort
+class SortIndex:
+    def __init__(self, key_func):
+        '''
+        key_func: Function that makes the sort key of a record
+        entries: Sorted list of (key, record id)
+        keys: Record id -> its current key, needed to find it again on removal
+        '''
+        self.key_func = key_func
+        self.entries = []
+        self.keys = {}
+
+    # Fill the index from scratch with a single sort
+    def build(self, records) -> None:
+        self.keys = {record.id: self.key_func(record) for record in records}
+        self.entries = sorted((key, record_id) for record_id, key in self.keys.items())
+
+    # Add a record, or move it if its key changed
+    def add(self, record) -> None:
+        key = self.key_func(record)
+        old = self.keys.get(record.id)
+        if old == key: # Nothing that affects the order changed
+            return
+        if old is not None:
+            self.__remove_entry(old, record.id)
+        bisect.insort(self.entries, (key, record.id))
+        self.keys[record.id] = key
+
+    # Remove a record
+    def remove(self, record_id) -> None:
+        key = self.keys.pop(record_id, None)
+        if key is not None:
+            self.__remove_entry(key, record_id)
+
+    # @ret: Record ids from smallest to largest key, or largest to smallest when reverse
+    def ids(self, reverse: bool = False) -> list:
+        entries = reversed(self.entries) if reverse else self.entries
+        return [record_id for _, record_id in entries]
+
+    def __remove_entry(self, key, record_id) -> None:
+        i = bisect.bisect_left(self.entries, (key, record_id))
+        del self.entries[i]
@@ -0,0 +1,806 @@
+'''
+Artifact: Pic-a-Pass strengthengine.py
+Description: Estimates how many guesses a password takes by splitting it into the patterns attackers try first
+             (common words, l33t spellings, dates, repeats, keyboard walks and sequences), after zxcvbn
+Author(s): Team
+Precondition(s): Optional ranked word lists (*.ranked, one word per line, most common first) packed into
+                 DICTIONARY_DIR/ranked.trie with python3 strengthengine.py
+Postcondition(s): None
+Error(s):
+- ValueError: ranked.trie is damaged or from another program
+Side effect(s): Loads the packed trie the first time a password is estimated
+Invariant(s): The estimate is the cheapest cover of the password by matches and brute force, found by dynamic programming
+Known fault(s): Longer passwords are estimated in pieces of MAX_ANALYZED, only a repeat is followed across pieces
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Bound dates and the cover search for long digit runs      |
+| Team         | 10/18/26   | Estimate long passwords in pieces, following repeats      |
+| Team         | 10/18/26   | Load the ranked trie packed on disk, not built at run time|
+| Team         | 10/18/26   | Walk words per position, resume the cover search          |
+#########################################################################################
+'''
+import array # Used for the packed trie
+import bisect # Used for building the trie from sorted words
+import math # Used for the guess counts
+import os # Used for finding the ranked word lists
+import re # Used for repeats, separated dates and years
+import struct # Used for the packed trie file header
+import sys # Used for the command line and the byte order of the trie file
+import threading # Used for building the trie once from any thread
+import time # Used for the reference year of dates
+import password_strength # Used for the ranked top 500 list
+from commonpasswords import DICTIONARY_DIR, default_dictionary
+
+MAX_ANALYZED = 64 # Characters split into patterns at once, keeps a long passphrase under the latency budget
+BRUTEFORCE_CARDINALITY = 10 # Guesses per character of anything no pattern explains
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10000 # Cost of every extra match, so a few big matches beat many small ones
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MEDIUM_GUESSES = 1e8 # Fewer guesses than this is weak
+STRONG_GUESSES = 1e10 # This many guesses or more is strong
+# Longest brute force stretch after a match. With a longer one the cover has two pieces, at least 2! orderings of
+# MIN_SUBMATCH_GUESSES_SINGLE_CHAR times 10 ** 9, so it is strong whatever else it holds
+MAX_BRUTEFORCE_SPAN = math.floor(math.log10(STRONG_GUESSES / (2 * MIN_SUBMATCH_GUESSES_SINGLE_CHAR)))
+# Most matches in a cover that can still be below STRONG_GUESSES, every match past the first multiplies in another
+# MIN_GUESSES_BEFORE_GROWING_SEQUENCE. Covers with more are strong either way and are never built
+MAX_COVER_MATCHES = math.ceil(math.log(STRONG_GUESSES, MIN_GUESSES_BEFORE_GROWING_SEQUENCE))
+REFERENCE_YEAR = time.localtime().tm_year
+MAX_DATE_LENGTH = 10 # Longest date matched, "1991-11-11"
+MIN_YEAR_SPACE = 20 # Dates are guessed this many years either side of now at least
+DATE_MIN_YEAR = 1000
+DATE_MAX_YEAR = 2050
+MAX_SEQUENCE_DELTA = 5 # Largest step between characters that still counts as a sequence (e.g. "acegi")
+TRIE_FILE = "ranked.trie" # Packed trie of the ranked lists, in DICTIONARY_DIR
+TRIE_MAGIC = b"PAPTRIE1"
+TRIE_HEADER = struct.Struct("<8sIII") # Magic, version, number of nodes, bytes of edge characters
+
+# Letters each character can stand in for
+L33T_TABLE = {
+    "4": "a", "@": "a", "8": "b", "(": "c", "{": "c", "[": "c", "<": "c", "3": "e", "6": "g", "9": "g",
+    "1": "il", "!": "i", "|": "il", "7": "lt", "0": "o", "$": "s", "5": "s", "+": "t", "%": "x", "2": "z",
+}
+
+# US keyboard rows, unshifted and shifted. Each row starts one key to the right of the row above it,
+# except the first two letter rows which line up, as drawn by zxcvbn
+QWERTY_ROWS = [
+    ("`1234567890-=", "~!@#$%^&*()_+", 0),
+    ("qwertyuiop[]\\", "QWERTYUIOP{}|", 1),
+    ("asdfghjkl;'", "ASDFGHJKL:\"", 1),
+    ("zxcvbnm,./", "ZXCVBNM<>?", 1),
+]
+
+# One part of a password explained by a pattern
+class Match:
+    __slots__ = ("pattern", "i", "j", "token", "guesses", "detail")
+
+    def __init__(self, pattern: str, i: int, j: int, token: str, guesses: float, detail: str = ""):
+        '''
+        pattern: "dictionary", "spatial", "sequence", "repeat", "date" or "bruteforce"
+        i, j: First and last position of the token in the password
+        token: The characters matched
+        guesses: Guesses needed for this token alone
+        detail: What was matched, e.g. the dictionary word or the repeated base
+        '''
+        self.pattern = pattern
+        self.i = i
+        self.j = j
+        self.token = token
+        self.guesses = guesses
+        self.detail = detail
+
+    def __repr__(self) -> str:
+        return f"Match({self.pattern}, {self.token!r}, {self.guesses:g})"
+
+# Result of an estimate
+class Estimate:
+    def __init__(self, password: str, guesses: float, sequence: list):
+        '''
+        guesses: Guesses an attacker following the patterns needs
+        sequence: Matches covering the password, in order
+        '''
+        self.password = password
+        self.guesses = guesses
+        self.sequence = sequence
+
+    # log2 of the guesses, comparable to calculate_entropy
+    def bits(self) -> float:
+        return math.log2(self.guesses)
+
+    # 0, 1 or 2 like p_strength
+    def strength(self) -> int:
+        if self.guesses < MEDIUM_GUESSES:
+            return 0
+        elif self.guesses < STRONG_GUESSES:
+            return 1
+        else:
+            return 2
+
+# Word -> rank trie kept as one string and two arrays, where a dict of edges took hundreds of bytes a word. Nodes
+# are numbered breadth first so the children of a node are consecutive and searching their characters gives the
+# child, the root is 0
+class RankedTrie:
+    def __init__(self, edges: str, first: array.array, ranks: array.array):
+        '''
+        edges: Node -> character on the edge into it, the root has a placeholder
+        first: Node -> its first child, its children are first[node] up to first[node + 1]. One entry past the
+               last node holds the number of nodes
+        ranks: Node -> rank of the word ending there, 0 if none does
+        '''
+        self.edges = edges
+        self.first = first
+        self.ranks = ranks
+
+    # Child of a node along a character, None if there is none
+    def step(self, node: int, char: str):
+        child = self.edges.find(char, self.first[node], self.first[node + 1])
+        return child if child > 0 else None
+
+    def __len__(self) -> int:
+        return sum(1 for rank in self.ranks if rank)
+
+# Pack words into a trie
+# words: Word -> rank, the words are not kept
+def pack_trie(words: dict) -> RankedTrie:
+    ordered = sorted(words)
+    edges = ["\0"]
+    first = array.array('I')
+    ranks = array.array('I')
+    # Words with a node's prefix are a run of the sorted list, the word ending at the node first if there is one
+    # and then one run per child, so each level is cut from the level before
+    level = [(0, len(ordered))]
+    depth = 0
+    nodes = 1
+    while level:
+        below = []
+        for lo, hi in level:
+            if len(ordered[lo]) == depth:
+                ranks.append(words[ordered[lo]])
+                lo += 1
+            else:
+                ranks.append(0)
+            first.append(nodes + len(below))
+            while lo < hi:
+                char = ordered[lo][depth]
+                end = bisect.bisect_left(ordered, ordered[lo][:depth] + chr(ord(char) + 1), lo, hi)
+                edges.append(char)
+                below.append((lo, end))
+                lo = end
+        nodes += len(below)
+        level = below
+        depth += 1
+    first.append(nodes)
+    return RankedTrie("".join(edges), first, ranks)
+
+# The ranked top 500 and every ranked list in a directory, each word at its best rank over all of them
+# directory: Where the *.ranked lists are, None for the top 500 alone
+def ranked_words(directory) -> dict:
+    words = {}
+    for rank, word in enumerate(password_strength.TOP_500_RANKED, 1):
+        words.setdefault(word.lower(), rank)
+    try:
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".ranked")) if directory else []
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        with open(os.path.join(directory, name), mode='r', encoding='utf-8', errors='replace') as file:
+            rank = 0
+            for line in file:
+                word = line.strip().lower()
+                if word:
+                    rank += 1
+                    if rank < words.get(word, rank + 1):
+                        words[word] = rank
+    return words
+
+# Write a trie for load_trie: header, ranks, first children, then the character into every node
+def save_trie(trie: RankedTrie, path: str) -> None:
+    ranks, first = array.array('I', trie.ranks), array.array('I', trie.first)
+    if sys.byteorder == "big": # The file is little endian
+        ranks.byteswap()
+        first.byteswap()
+    edges = trie.edges.encode('utf-8', errors='surrogatepass')
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode='wb') as file:
+        file.write(TRIE_HEADER.pack(TRIE_MAGIC, 1, len(ranks), len(edges)))
+        file.write(ranks.tobytes())
+        file.write(first.tobytes())
+        file.write(edges)
+    os.replace(tmp_path, path)
+
+# Read a trie written by save_trie, two array copies and a decode rather than a rebuild
+def load_trie(path: str) -> RankedTrie:
+    with open(path, mode='rb') as file:
+        data = file.read()
+    if len(data) < TRIE_HEADER.size:
+        raise ValueError(f"{path} is not a packed trie")
+    magic, version, nodes, edge_bytes = TRIE_HEADER.unpack_from(data)
+    if magic != TRIE_MAGIC or version != 1 or len(data) != TRIE_HEADER.size + 4 * (2 * nodes + 1) + edge_bytes:
+        raise ValueError(f"{path} is damaged or not a packed trie")
+    ranks = array.array('I', data[TRIE_HEADER.size:TRIE_HEADER.size + 4 * nodes])
+    first = array.array('I', data[TRIE_HEADER.size + 4 * nodes:TRIE_HEADER.size + 4 * (2 * nodes + 1)])
+    if sys.byteorder == "big":
+        ranks.byteswap()
+        first.byteswap()
+    edges = data[len(data) - edge_bytes:].decode('utf-8', errors='surrogatepass')
+    if len(edges) != nodes:
+        raise ValueError(f"{path} is damaged or not a packed trie")
+    return RankedTrie(edges, first, ranks)
+
+_trie = None
+_trie_lock = threading.Lock()
+
+# The packed trie in DICTIONARY_DIR, loaded on first use. Without one only the ranked top 500 is known, the ranked
+# lists are never read at run time
+def ranked_trie(directory: str = DICTIONARY_DIR) -> RankedTrie:
+    global _trie
+    if _trie is not None:
+        return _trie
+    with _trie_lock:
+        if _trie is None:
+            path = os.path.join(directory, TRIE_FILE)
+            if os.path.exists(path):
+                _trie = load_trie(path)
+            else:
+                _trie = pack_trie(ranked_words(None)) # Nothing prepared, the top 500 is enough to run
+    return _trie
+
+# Number of ways to choose k of n
+def n_ck(n: int, k: int) -> int:
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+# Guesses for the capitalization of a token, 1 when it is all lowercase
+def uppercase_variations(token: str) -> int:
+    if token == token.lower():
+        return 1
+    upper = sum(1 for char in token if char.isupper())
+    lower = sum(1 for char in token if char.islower())
+    # First letter, last letter or everything uppercase are tried straight away
+    if lower == 0 or (upper == 1 and (token[0].isupper() or token[-1].isupper())):
+        return 2
+    return sum(n_ck(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+# Guesses for the l33t substitutions in a token
+# subs: (character, letter it stands for) pairs
+def l33t_variations(token: str, subs: tuple) -> int:
+    variations = 1
+    lowered = token.lower()
+    for subbed, letter in subs:
+        s = lowered.count(subbed)
+        u = lowered.count(letter)
+        if s == 0 or u == 0:
+            variations *= 2 # All or none substituted
+        else:
+            variations *= sum(n_ck(s + u, i) for i in range(1, min(s, u) + 1))
+    return variations
+
+# Dictionary words ending at one position, plain, l33t spelled and reversed. A word is found by walking the trie
+# from its start, the walks that can still go on are carried from one position to the next, so text typed at the end
+# only costs its new positions
+# lowered: password.lower()
+# k: The position
+# walks: (start, [(node, substitutions so far)]) of the walks still open before k, in order of start
+# Returns the walks still open after k, the words ending at k and the reversed words ending at k
+def words_ending_at(password: str, lowered: str, k: int, walks: list) -> tuple:
+    trie = ranked_trie()
+    edges, first, ranks = trie.edges, trie.first, trie.ranks # trie.step() inlined, this is the innermost loop
+    char = lowered[k]
+    letters = L33T_TABLE.get(char)
+    still_open = []
+    words = []
+    for i, frontier in walks + [(k, [(0, ())])]:
+        advanced = []
+        for node, subs in frontier:
+            lo, hi = first[node], first[node + 1]
+            child = edges.find(char, lo, hi)
+            if child > 0:
+                advanced.append((child, subs))
+            if not letters:
+                continue
+            mapped = None
+            for subbed, other in subs:
+                if subbed == char:
+                    mapped = other
+                    break
+            if mapped is None:
+                for letter in letters:
+                    child = edges.find(letter, lo, hi)
+                    if child > 0:
+                        advanced.append((child, subs + ((char, letter),)))
+            else: # One character stands for one letter throughout a word
+                child = edges.find(mapped, lo, hi)
+                if child > 0:
+                    advanced.append((child, subs))
+        if not advanced:
+            continue
+        still_open.append((i, advanced))
+        for node, subs in advanced:
+            if ranks[node] and not (subs and k == i): # A single l33t character is not a word
+                token = password[i:k + 1]
+                guesses = ranks[node] * uppercase_variations(token) * l33t_variations(token, subs)
+                words.append(Match("dictionary", i, k, token, guesses, token.lower()))
+    # Words typed backwards, without l33t, walked back from k
+    reversed_words = []
+    node = 0
+    for i in range(k, -1, -1):
+        node = edges.find(lowered[i], first[node], first[node + 1])
+        if node < 0:
+            break
+        if ranks[node] and i < k:
+            token = password[i:k + 1]
+            if token.lower() != token.lower()[::-1]: # Palindromes are already found forwards
+                reversed_words.append(Match("dictionary", i, k, token, ranks[node] * uppercase_variations(token) * 2, lowered[i:k + 1][::-1]))
+    return still_open, words, reversed_words
+
+# Every dictionary word in the password, plain, l33t spelled and reversed
+def dictionary_matches(password: str) -> list:
+    lowered = password.lower()
+    walks = []
+    matches = []
+    reversed_matches = []
+    for k in range(len(password)):
+        walks, words, reversed_words = words_ending_at(password, lowered, k, walks)
+        matches += words
+        reversed_matches += reversed_words
+    return matches + reversed_matches
+
+# Key -> (row, column, shifted) and position -> unshifted key, built once
+_KEYS = {}
+_POSITIONS = {}
+for _row, (_plain, _shifted, _offset) in enumerate(QWERTY_ROWS):
+    for _column, (_key, _shift_key) in enumerate(zip(_plain, _shifted)):
+        _KEYS[_key] = (_row, _column + _offset, False)
+        _KEYS[_shift_key] = (_row, _column + _offset, True)
+        _POSITIONS[(_row, _column + _offset)] = _key
+# Left, up left, up right, right, down right, down left
+_DIRECTIONS = [(0, -1), (-1, 0), (-1, 1), (0, 1), (1, 0), (1, -1)]
+KEY_STARTING_POSITIONS = len(_KEYS) # Shifted and unshifted characters both start a walk
+KEY_AVERAGE_DEGREE = sum(sum((row + dr, column + dc) in _POSITIONS for dr, dc in _DIRECTIONS) for row, column in _POSITIONS) / len(_POSITIONS)
+
+# Direction from one key to the next, None when they are not next to each other
+def key_direction(a: str, b: str):
+    key_a, key_b = _KEYS.get(a), _KEYS.get(b)
+    if key_a is None or key_b is None:
+        return None
+    step = (key_b[0] - key_a[0], key_b[1] - key_a[1])
+    return _DIRECTIONS.index(step) if step in _DIRECTIONS else None
+
+# Guesses for a keyboard walk of a length with a number of turns and shifted keys
+def spatial_guesses(length: int, turns: int, shifted: int) -> float:
+    guesses = 0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += n_ck(i - 1, j - 1) * KEY_STARTING_POSITIONS * KEY_AVERAGE_DEGREE ** j
+    if shifted:
+        unshifted = length - shifted
+        if unshifted == 0:
+            guesses *= 2
+        else:
+            guesses *= sum(n_ck(shifted + unshifted, i) for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+# Runs of three or more neighbouring keys, e.g. "qwerty", "zxcvb" or "1qaz"
+def spatial_matches(password: str) -> list:
+    matches = []
+    n = len(password)
+    i = 0
+    while i < n - 1:
+        j = i + 1
+        last_direction = None
+        turns = 0
+        while j < n:
+            direction = key_direction(password[j - 1], password[j])
+            if direction is None:
+                break
+            if direction != last_direction:
+                turns += 1
+                last_direction = direction
+            j += 1
+        if j - i >= 3:
+            token = password[i:j]
+            shifted = sum(1 for char in token if _KEYS[char][2])
+            matches.append(Match("spatial", i, j - 1, token, spatial_guesses(len(token), turns, shifted), "qwerty"))
+        i = j
+    return matches
+
+# Runs with an even step between character codes, e.g. "abcd", "9753" or "aceg"
+def sequence_matches(password: str) -> list:
+    matches = []
+    n = len(password)
+    if n < 2:
+        return matches
+
+    def add(i, j, delta):
+        if (j - i > 1 or abs(delta) == 1) and 0 < abs(delta) <= MAX_SEQUENCE_DELTA:
+            token = password[i:j + 1]
+            first = token[0]
+            if first in "aAzZ019": # Obvious starting points
+                base = 4
+            elif first.isdigit():
+                base = 10
+            else:
+                base = 26
+            if delta < 0:
+                base *= 2
+            matches.append(Match("sequence", i, j, token, base * len(token)))
+
+    i = 0
+    last_delta = None
+    for k in range(1, n):
+        delta = ord(password[k]) - ord(password[k - 1])
+        if last_delta is None:
+            last_delta = delta
+        if delta == last_delta:
+            continue
+        add(i, k - 1, last_delta)
+        i = k - 1
+        last_delta = delta
+    add(i, n - 1, last_delta)
+    return matches
+
+_GREEDY_REPEAT = re.compile(r"(.+)\1+", re.DOTALL)
+_LAZY_REPEAT = re.compile(r"(.+?)\1+", re.DOTALL)
+_LAZY_ANCHORED_REPEAT = re.compile(r"^(.+?)\1+$", re.DOTALL)
+
+# Repeated blocks, e.g. "aaaa" or "abcabcabc". The repeated base is estimated on its own
+def repeat_matches(password: str, cache: dict) -> list:
+    matches = []
+    last = 0
+    while last < len(password):
+        greedy = _GREEDY_REPEAT.search(password, last)
+        if greedy is None:
+            break
+        lazy = _LAZY_REPEAT.search(password, last)
+        if len(greedy.group(0)) > len(lazy.group(0)): # e.g. "aabaab", the repeat of "aab" beats the one of "a"
+            match = greedy
+            base = _LAZY_ANCHORED_REPEAT.match(match.group(0)).group(1)
+        else:
+            match = lazy
+            base = match.group(1)
+        i, j = match.start(), match.end() - 1
+        # A single repeated character has nothing to split, e.g. "aaaa", its estimate is one brute forced character
+        base_guesses = bruteforce_guesses(1) + 1 if len(base) == 1 else _estimate(base, cache).guesses
+        matches.append(Match("repeat", i, j, match.group(0), base_guesses * (len(match.group(0)) // len(base)), base))
+        last = j + 1
+    return matches
+
+# Ways to split undivided digits into day, month and year, by length
+DATE_SPLITS = {
+    4: [(1, 2), (2, 3)], # 1 1 91, 11 1 91
+    5: [(1, 3), (2, 3)], # 1 11 91, 11 1 91
+    6: [(1, 2), (2, 4), (4, 5)], # 1 1 1991, 11 11 91, 1991 1 1
+    7: [(1, 3), (2, 3), (4, 5), (4, 6)], # 1 11 1991, 11 1 1991, 1991 1 11, 1991 11 1
+    8: [(2, 4), (4, 6)], # 11 11 1991, 1991 11 11
+}
+_SEPARATED_DATE = re.compile(r"(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4})")
+_YEAR = re.compile(r"19[0-9][0-9]|20[0-9][0-9]")
+_DIGITS = re.compile(r"[0-9]{4,}")
+_SEPARATOR = re.compile(r"[0-9][\s/\\_.-][0-9]")
+
+# Day and month from two numbers in either order
+def _day_month(a: int, b: int):
+    for day, month in ((a, b), (b, a)):
+        if 1 <= day <= 31 and 1 <= month <= 12:
+            return day, month
+    return None
+
+# Year, month and day from three numbers in any common order, None if they can't be a date
+def _date(ints: list):
+    if ints[1] > 31 or ints[1] <= 0:
+        return None
+    over_12 = over_31 = under_1 = 0
+    for value in ints:
+        if 99 < value < DATE_MIN_YEAR or value > DATE_MAX_YEAR:
+            return None
+        over_31 += value > 31
+        over_12 += value > 12
+        under_1 += value <= 0
+    if over_31 >= 2 or over_12 == 3 or under_1 >= 2:
+        return None
+    splits = [(ints[2], ints[0], ints[1]), (ints[0], ints[1], ints[2])] # Year last or year first
+    for year, a, b in splits:
+        if DATE_MIN_YEAR <= year <= DATE_MAX_YEAR:
+            return year if _day_month(a, b) else None
+    for year, a, b in splits:
+        if _day_month(a, b):
+            return year + 1900 if 50 < year <= 99 else year + 2000 if year <= 50 else year
+    return None
+
+# Guesses for a date in a year
+def date_guesses(year: int, separator: bool) -> float:
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE) * 365 * (4 if separator else 1)
+
+# Year of the likeliest date undivided digits can be read as, None if they can't be a date
+# fields: fields[i][length - 1] is the value of the length digits from i in the run, for 1 to 4 digits
+# i, length: Where the digits start in the run and how many there are (4 to 8)
+def undivided_date(fields: list, i: int, length: int):
+    best = None
+    for k, l in DATE_SPLITS[length]:
+        middle = fields[i + k][l - k - 1]
+        if not 0 < middle <= 31: # The middle is always a day or month, most splits fail here
+            continue
+        first, last = fields[i][k - 1], fields[i + l][length - l - 1]
+        if not (0 < first <= 31 or 0 < last <= 31): # One end has to be the other day or month
+            continue
+        year = _date([first, middle, last])
+        # The most recent reading is the likeliest
+        if year is not None and (best is None or abs(year - REFERENCE_YEAR) < abs(best - REFERENCE_YEAR)):
+            best = year
+    return best
+
+# Dates with or without separators, e.g. "13/05/1998" or "130598", and lone recent years
+def date_matches(password: str) -> list:
+    matches = []
+    n = len(password)
+    for run in _DIGITS.finditer(password): # Undivided dates only ever lie inside a run of digits
+        start, end = run.span()
+        # Every 1 to 4 digit field is read once, not once per split of every candidate
+        fields = [[int(password[i:i + length]) for length in range(1, min(4, end - i) + 1)] for i in range(start, end)]
+        reach = -1 # End of the last date found, dates inside it are dropped below anyway so they aren't read
+        for i in range(start, end - 3):
+            for j in range(min(end, i + 8) - 1, max(i + 3, reach + 1) - 1, -1): # Longest first, a shorter date from the same start is inside it
+                year = undivided_date(fields, i - start, j - i + 1)
+                if year is not None:
+                    matches.append(Match("date", i, j, password[i:j + 1], date_guesses(year, False), str(year)))
+                    reach = j
+                    break
+    for i in range(n - 5 if _SEPARATOR.search(password) else 0):
+        if password[i] not in "0123456789":
+            continue
+        for j in range(i + 5, min(n, i + 10)):
+            found = _SEPARATED_DATE.fullmatch(password, i, j + 1)
+            if found is None:
+                continue
+            year = _date([int(found.group(1)), int(found.group(3)), int(found.group(4))])
+            if year is not None:
+                matches.append(Match("date", i, j, found.group(0), date_guesses(year, True), str(year)))
+    # Drop dates inside longer dates, "1998" inside "13051998" adds nothing. Sorted by start then longest
+    # first, a date is inside another exactly when an earlier one reaches as far
+    kept = []
+    reach = -1
+    for match in sorted(matches, key=lambda match: (match.i, -match.j)):
+        if match.j > reach:
+            kept.append(match)
+            reach = match.j
+    matches = kept
+    for found in _YEAR.finditer(password):
+        matches.append(Match("date", found.start(), found.end() - 1, found.group(0), max(abs(int(found.group(0)) - REFERENCE_YEAR), MIN_YEAR_SPACE), found.group(0)))
+    return matches
+
+# Whether a cover below STRONG_GUESSES can hold a date, False if every cover with one is strong. Such a cover has
+# at most MAX_COVER_MATCHES pieces and none of its brute force is as long as a date, so once the password is longer
+# than that many dates the other pieces have to include a long match of another kind. Random digit runs have none,
+# and their dates are the slowest to find
+# length: Length of the password
+# matches: Every match but dates
+def may_hold_date(length: int, matches: list) -> bool:
+    if length <= MAX_COVER_MATCHES * MAX_DATE_LENGTH:
+        return True
+    longest = max((match.j - match.i + 1 for match in matches), default=0)
+    return longest * (MAX_COVER_MATCHES - 1) >= length - MAX_DATE_LENGTH
+
+# Guesses for brute forcing a stretch of characters, a little over the least a match of that length can cost
+# so a match of the same guesses is preferred
+def bruteforce_guesses(length: int) -> float:
+    try:
+        guesses = float(BRUTEFORCE_CARDINALITY) ** length
+    except OverflowError: # Over 308 characters, past what a float holds
+        return math.inf
+    return max(guesses, (MIN_SUBMATCH_GUESSES_SINGLE_CHAR if length == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR) + 1)
+
+_BRUTEFORCE_GUESSES = [bruteforce_guesses(length) for length in range(MAX_ANALYZED + 1)] # Every length that is analyzed
+
+# The matches the cover search looks at, by the position they end at. Of several matches over the same characters
+# only the cheapest can be in the best cover, and no part of a password is guessed in fewer than a minimum
+# n: Length of the password
+def matches_by_end(n: int, matches: list) -> list:
+    cheapest = {} # (i, j) -> match
+    for match in matches:
+        minimum = 1 if match.j - match.i + 1 == n else MIN_SUBMATCH_GUESSES_SINGLE_CHAR if match.i == match.j else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+        if match.guesses < minimum: # A copy, the same match can be the whole of a shorter password
+            match = Match(match.pattern, match.i, match.j, match.token, minimum, match.detail)
+        other = cheapest.get((match.i, match.j))
+        if other is None or match.guesses < other.guesses:
+            cheapest[(match.i, match.j)] = match
+    by_end = [[] for _ in range(n)]
+    for match in cheapest.values():
+        by_end[match.j].append(match)
+    return by_end
+
+# Cheapest way to cover a password with matches and brute force, by dynamic programming over its prefixes. Each
+# prefix keeps its best product of guesses per number of matches, since more matches cost more (l! orderings plus
+# MIN_GUESSES_BEFORE_GROWING_SEQUENCE each). A cover only grows more expensive as it is extended, so covers at
+# STRONG_GUESSES or more are dropped as soon as they get there, as are covers of more than MAX_COVER_MATCHES matches
+# or with a brute force stretch longer than MAX_BRUTEFORCE_SPAN after a match. Brute forcing the whole password is
+# always kept, so a strong password still gets an estimate, only guesses above STRONG_GUESSES can change.
+# The row of a prefix only depends on the matches ending inside it, so when text is typed at the end the rows up to
+# the first changed match are kept
+class CoverSearch:
+    def __init__(self):
+        '''
+        keys: Position -> the matches ending there as the row was found with, to tell when a row is out of date
+        best_match: Position -> number of matches -> last match, or where its brute force stretch starts
+        best_pi: Position -> number of matches -> product of guesses
+        best_g: Position -> number of matches -> total guesses
+        match_ends: Position -> (position, numbers of matches) where a pattern match is among the best up to there,
+                    brute force can only follow those
+        '''
+        self.keys = []
+        self.best_match = []
+        self.best_pi = []
+        self.best_g = []
+        self.match_ends = []
+
+    # Forget the rows from a position on, e.g. when the password is cut short there
+    def truncate(self, k: int) -> None:
+        for rows in (self.keys, self.best_match, self.best_pi, self.best_g, self.match_ends):
+            del rows[k:]
+
+    # Bring the rows up to date with the matches of the password, from the first position whose matches changed
+    # by_end: matches_by_end() of the password
+    def search(self, by_end: list) -> None:
+        n = len(by_end)
+        keys = [[(match.pattern, match.i, match.guesses, match.detail) for match in matches] for matches in by_end]
+        start = 0
+        while start < min(n, len(self.keys)) and keys[start] == self.keys[start]:
+            start += 1
+        self.truncate(start)
+        self.keys.extend(keys[start:])
+        best_match, best_pi, best_g = self.best_match, self.best_pi, self.best_g
+        match_ends = list(self.match_ends[-1]) if start else [] # Brute force stretches to the rows before
+        bruteforce = _BRUTEFORCE_GUESSES if n <= MAX_ANALYZED else [bruteforce_guesses(length) for length in range(n + 1)]
+        factorials = [math.factorial(count) for count in range(MAX_COVER_MATCHES + 1)]
+        growth = [MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** count for count in range(MAX_COVER_MATCHES)]
+
+        # Brute force stretches are only made into matches for the best cover, most are replaced before that
+        def update(i, k, guesses, match, count):
+            pi = guesses * best_pi[i - 1][count - 1] if count > 1 else guesses
+            g = factorials[count] * pi + growth[count - 1]
+            if g >= STRONG_GUESSES:
+                return
+            for other_count, other_g in best_g[k].items(): # Fewer matches for the same guesses always wins
+                if other_count <= count and other_g <= g:
+                    return
+            best_g[k][count] = g
+            best_match[k][count] = i if match is None else match
+            best_pi[k][count] = pi
+
+        for k in range(start, n):
+            best_match.append({})
+            best_pi.append({})
+            best_g.append({})
+            for match in by_end[k]:
+                if match.i > 0:
+                    for count in list(best_match[match.i - 1]):
+                        if count < MAX_COVER_MATCHES:
+                            update(match.i, k, match.guesses, match, count + 1)
+                else:
+                    update(0, k, match.guesses, match, 1)
+            # Brute force from the start or from the end of a match to k, never straight after another brute force stretch
+            scores = best_g[k]
+            g = bruteforce[k + 1] + 1
+            if scores.get(1, math.inf) > g: # update(0, k, bruteforce[k + 1], None, 1) inlined, only one match to beat
+                scores[1] = g
+                best_match[k][1] = 0
+                best_pi[k][1] = bruteforce[k + 1]
+            for end, counts in match_ends: # update() inlined, this is the innermost loop
+                guesses = bruteforce[k - end]
+                for count in counts:
+                    pi = guesses * best_pi[end][count]
+                    g = factorials[count + 1] * pi + growth[count]
+                    if g >= STRONG_GUESSES:
+                        continue
+                    for other_count, other_g in scores.items():
+                        if other_count <= count + 1 and other_g <= g:
+                            break
+                    else:
+                        scores[count + 1] = g
+                        best_match[k][count + 1] = end + 1
+                        best_pi[k][count + 1] = pi
+            counts = [count for count, match in best_match[k].items() if type(match) is Match and count < MAX_COVER_MATCHES]
+            if counts:
+                match_ends.append((k, counts))
+            if match_ends and match_ends[0][0] < k - MAX_BRUTEFORCE_SPAN: # Too far back to brute force from any more
+                match_ends.pop(0)
+            self.match_ends.append(tuple(match_ends))
+
+    # Guesses of the best cover of the password searched and its matches in order
+    def best(self, password: str) -> tuple:
+        n = len(password)
+        if n == 0:
+            return 1.0, []
+        count = min(self.best_g[n - 1], key=self.best_g[n - 1].get)
+        guesses = self.best_g[n - 1][count]
+        sequence = []
+        k = n - 1
+        while k >= 0:
+            match = self.best_match[k][count]
+            if type(match) is int: # Start of a brute force stretch
+                match = Match("bruteforce", match, k, password[match:k + 1], bruteforce_guesses(k - match + 1))
+            sequence.append(match)
+            k = match.i - 1
+            count -= 1
+        sequence.reverse()
+        return guesses, sequence
+
+# Cheapest way to cover the password with matches and brute force, see CoverSearch
+def most_guessable(password: str, matches: list) -> tuple:
+    search = CoverSearch()
+    search.search(matches_by_end(len(password), matches))
+    return search.best(password)
+
+# Estimate of a password longer than MAX_ANALYZED, made piece by piece. A repeat that runs to the end of a piece
+# is followed on past it and the piece is cut where the repeat starts, so "password" * 10 is ten "password"s rather
+# than eight and a brute forced tail. Once the product is strong the rest is brute forced, that only changes
+# guesses above STRONG_GUESSES
+def _estimate_pieces(password: str, cache: dict) -> Estimate:
+    n = len(password)
+    guesses = 1.0
+    sequence = []
+    pos = 0
+    while pos < n:
+        if guesses >= STRONG_GUESSES:
+            rest = Match("bruteforce", pos, n - 1, password[pos:], bruteforce_guesses(n - pos))
+            guesses *= rest.guesses
+            sequence.append(rest)
+            break
+        end = min(n, pos + MAX_ANALYZED)
+        repeat = None
+        if end < n:
+            for match in repeat_matches(password[pos:end], cache):
+                period = len(match.detail)
+                reach = pos + match.j + 1
+                while reach < n and password[reach] == password[reach - period]:
+                    reach += 1
+                if reach > end: # Only the last repeat can go on into the next piece
+                    count = (reach - pos - match.i) // period
+                    repeat = Match("repeat", pos + match.i, pos + match.i + count * period - 1, password[pos + match.i:pos + match.i + count * period],
+                                   match.guesses / (len(match.token) // period) * count, match.detail)
+        if repeat is not None:
+            end = repeat.i
+        if end > pos:
+            part = _estimate(password[pos:end], cache)
+            guesses *= part.guesses
+            sequence.extend(Match(match.pattern, match.i + pos, match.j + pos, match.token, match.guesses, match.detail) for match in part.sequence)
+        if repeat is not None:
+            guesses *= repeat.guesses
+            sequence.append(repeat)
+            end = repeat.j + 1
+        pos = end
+    return Estimate(password, guesses, sequence)
+
+def _estimate(password: str, cache: dict) -> Estimate:
+    found = cache.get(password)
+    if found is None:
+        if len(password) > MAX_ANALYZED:
+            found = _estimate_pieces(password, cache)
+        else:
+            matches = (dictionary_matches(password) + spatial_matches(password) + sequence_matches(password)
+                       + repeat_matches(password, cache))
+            if may_hold_date(len(password), matches):
+                matches += date_matches(password)
+            found = Estimate(password, *most_guessable(password, matches))
+        cache[password] = found
+    return found
+
+# Guesses needed for a password and the patterns that explain it
+def estimate(password: str) -> Estimate:
+    return _estimate(password, {})
+
+# Drop in replacement for password_strength.p_strength, 0, 1 or 2
+def guess_strength(password: str) -> int:
+    if len(password) == 0:
+        return 0
+    if password in default_dictionary(): # In a prepared list without ranks, as p_strength
+        return 0
+    return estimate(password).strength()
+
+# Pack the ranked lists: python3 strengthengine.py [DIRECTORY]
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else DICTIONARY_DIR
+    out_path = os.path.join(directory, TRIE_FILE)
+    save_trie(pack_trie(ranked_words(directory)), out_path)
+    print(f"Wrote {out_path} ({os.path.getsize(out_path):,} bytes)")
@@ -0,0 +1,94 @@
+'''
+Artifact: Pic-a-Pass strengthestimator.py
+Description: Password strength while typing, only the positions changed since the last keystroke are walked for
+             words and searched for covers
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s): None
+Side effect(s): None
+Invariant(s): strength() equals strengthengine.guess_strength of the same text
+Known fault(s): Keyboard walks, sequences, repeats and dates are linear scans and are found again on every change.
+                Text longer than strengthengine.MAX_ANALYZED is estimated from scratch
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Follow the pattern engine, keep the rows of the old prefix|
+#########################################################################################
+'''
+import os # Used for the prefix the old and new text share
+import strengthengine # Used for the matches, the cover search and the estimate
+from commonpasswords import default_dictionary # Used for the prepared lists without ranks, as guess_strength
+
+# Keeps what strengthengine needs about the text typed so far, per position, so a keystroke costs the positions
+# after the first changed one instead of an estimate of the whole password
+class StrengthEstimator:
+    def __init__(self):
+        '''
+        text: Text the state below describes
+        walks: Position -> dictionary walks still open after it
+        words: Position -> dictionary words ending there
+        reversed_words: Position -> words typed backwards ending there
+        cover: Cover search over the text, its rows before the first changed match are kept
+        cache: Estimates of repeated parts, shared between keystrokes
+        estimated: Estimate of the text, None until asked for
+        '''
+        self.reset()
+
+    # Forget the text, e.g. when the field is cleared
+    def reset(self) -> None:
+        self.text = ""
+        self.walks = []
+        self.words = []
+        self.reversed_words = []
+        self.cover = strengthengine.CoverSearch()
+        self.cache = {}
+        self.estimated = None
+
+    # Bring the state up to date with the text in the field. Everything about the prefix the old and new text
+    # share is kept, so typing or deleting at the end only walks the new positions
+    def update(self, text: str) -> None:
+        if text == self.text:
+            return
+        keep = len(os.path.commonprefix([self.text, text]))
+        del self.walks[keep:]
+        del self.words[keep:]
+        del self.reversed_words[keep:]
+        self.text = text
+        self.estimated = None
+        lowered = text.lower()
+        for k in range(keep, min(len(text), strengthengine.MAX_ANALYZED)): # Longer text is estimated in pieces
+            walks, words, reversed_words = strengthengine.words_ending_at(text, lowered, k, self.walks[-1] if k else [])
+            self.walks.append(walks)
+            self.words.append(words)
+            self.reversed_words.append(reversed_words)
+
+    # Guesses needed for the text and the patterns that explain it, as strengthengine.estimate
+    def estimate(self) -> strengthengine.Estimate:
+        if self.estimated is None:
+            text = self.text
+            if len(text) > strengthengine.MAX_ANALYZED:
+                self.estimated = strengthengine.estimate(text)
+            else:
+                if len(self.cache) > strengthengine.MAX_ANALYZED: # Repeated parts of text long gone
+                    self.cache.clear()
+                # In the order strengthengine._estimate finds them, so ties between covers go the same way
+                matches = [match for words in self.words for match in words]
+                matches += [match for words in self.reversed_words for match in words]
+                matches += (strengthengine.spatial_matches(text) + strengthengine.sequence_matches(text)
+                            + strengthengine.repeat_matches(text, self.cache))
+                if strengthengine.may_hold_date(len(text), matches):
+                    matches += strengthengine.date_matches(text)
+                self.cover.search(strengthengine.matches_by_end(len(text), matches))
+                self.estimated = strengthengine.Estimate(text, *self.cover.best(text))
+        return self.estimated
+
+    # 0, 1 or 2 like guess_strength
+    def strength(self) -> int:
+        if not self.text:
+            return 0
+        if self.text in default_dictionary():
+            return 0
+        return self.estimate().strength()
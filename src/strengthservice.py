@@ -0,0 +1,80 @@
+'''
+Artifact: Pic-a-Pass strengthservice.py
+Description: Password strength scoring with a small cache, so the same password is only scored once
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s): None, errors from the scorer are passed on and never cached
+Side effect(s): None
+Invariant(s): Passwords are never kept, the cache is keyed by an HMAC under a random per-session key
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Pluggable scorer, e.g. strengthengine.guess_strength      |
+| Team         | 10/18/26   | Score with strengthengine.guess_strength by default       |
+#########################################################################################
+'''
+import hashlib # Used for the cache key hash function
+import hmac # Used for keyed cache keys
+import os # Used for the random cache key
+import threading # Used for sharing the cache between threads
+from collections import OrderedDict # Used for least recently used order
+from strengthengine import guess_strength
+
+STRENGTH_CACHE_SIZE = 256 # Most distinct passwords remembered at once
+
+# A strength scorer, strengthengine.guess_strength unless told otherwise, with a bounded least recently used cache
+class StrengthService:
+    def __init__(self, max_entries: int = STRENGTH_CACHE_SIZE, scorer=guess_strength):
+        '''
+        max_entries: Most results kept, the least recently used is dropped first
+        scorer: Function password -> 0, 1 or 2, guess_strength or password_strength.p_strength
+        hits: Number of strengths answered from the cache
+        misses: Number of strengths that had to be scored
+        '''
+        self.max_entries = max_entries
+        self.scorer = scorer
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict() # HMAC of the password -> strength
+        self._key = os.urandom(32) # Only lives in memory, a new one each time the cache is cleared
+        self._lock = threading.Lock()
+
+    # Strength of a password, 0, 1 or 2 like p_strength
+    def strength(self, password: str) -> int:
+        key = hmac.new(self._key, password.encode('utf-8', errors='surrogatepass'), hashlib.sha256).digest()
+        with self._lock:
+            strength = self._cache.get(key)
+            if strength is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return strength
+        strength = self.scorer(password) # Scored outside the lock, two threads scoring the same password is harmless
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = strength
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return strength
+
+    # Forget every result, e.g. on lock, logout or quit. The key is replaced so old keys can't be matched again
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self._key = os.urandom(32)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+_default = None # Shared service used by the password windows
+
+# Service used by every window that shows a password strength
+def strength_service() -> StrengthService:
+    global _default
+    if _default is None:
+        _default = StrengthService()
+    return _default
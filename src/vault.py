@@ -0,0 +1,245 @@
+'''
+Artifact: Pic-a-Pass vault.py
+Description: In-memory repository of the password profiles saved by a storage backend
+Author(s): Team
+Precondition(s): The user has logged in so the cipher has a key
+Postcondition(s): None
+Error(s):
+- File save error: Cannot save to the vault file as it has writing issues.
+Side effect(s): Writes to the storage backend whenever a record is inserted, updated or deleted
+Invariant(s): The records held in memory always match what the storage backend has saved
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | Decrypt passwords on demand with a short-lived cache      |
+| Team         | 10/18/26   | Bulk decryption of records                                |
+| Team         | 10/18/26   | Pluggable storage, journaled by default                   |
+| Team         | 10/18/26   | Sorting delegated to backends with indexes                |
+| Team         | 10/18/26   | Trigram search index                                      |
+| Team         | 10/18/26   | Sorted indexes kept up to date for every list order       |
+| Team         | 10/18/26   | Expire cached passwords on a timer, never cache on save   |
+#########################################################################################
+'''
+import time # Used for timestamping records
+from vaultstorage import JournalStorage, new_record_id # Used for saving records
+from searchindex import SearchIndex # Used for searching records
+from sortindex import SortIndex, website_key, timestamp_key # Used for keeping the list orders ready
+
+# A single password profile from the vault. The password stays encrypted until it is first read
+class PasswordRecord:
+    def __init__(self, record_id: str, website: str, username: str, ciphertext: str, notes: str, timestamp: float, nonce: str, cipher=None, cache_ttl: float = 0.0, cached: set = None):
+        '''
+        id: Identifier of the record, used as its key by the storage backend
+        website: Website the profile is for
+        username: Username for the website
+        ciphertext: base64 encoded encrypted password
+        notes: Notes for the profile
+        timestamp: Time the profile was last updated (seconds since the epoch)
+        nonce: base64 encoded nonce used when encrypting the password
+        cipher: PasswordCipher used to decrypt the password on demand
+        cache_ttl: Seconds to keep the decrypted password around after reading it (0 disables caching)
+        cached: Set shared with the vault holding every record with a cached plaintext, so expiry only looks at those
+        '''
+        self.id = record_id
+        self.website = website
+        self.username = username
+        self.ciphertext = ciphertext
+        self.notes = notes
+        self.timestamp = timestamp
+        self.nonce = nonce
+        self.cipher = cipher
+        self.cache_ttl = cache_ttl
+        self.cached = cached
+        self._secret = None # Cached plaintext, only set while the cache is live
+        self._secret_expires = 0.0 # time.monotonic() value the cached plaintext expires at
+
+    # The decrypted password. Decrypts on first read and keeps the plaintext for cache_ttl seconds
+    @property
+    def secret(self) -> str:
+        if self._secret is not None and time.monotonic() < self._secret_expires: # Cache is still live
+            return self._secret
+        secret = self.cipher.decrypt(self.ciphertext, self.nonce, self.username.encode('utf-8')) # Username is the authentication data
+        self.__cache_secret(secret)
+        return secret
+
+    # Replace the encrypted password. Nothing is cached until the new password is read
+    def set_encrypted(self, ciphertext: str, nonce: str) -> None:
+        self.ciphertext = ciphertext
+        self.nonce = nonce
+        self.forget_secret()
+
+    # Drop the cached plaintext so the next read decrypts again
+    def forget_secret(self) -> None:
+        self._secret = None
+        self._secret_expires = 0.0
+        if self.cached is not None:
+            self.cached.discard(self)
+
+    # Drop the cached plaintext if its time is up
+    # now: time.monotonic() value to compare against
+    def expire_secret(self, now: float) -> None:
+        if self._secret is not None and now >= self._secret_expires:
+            self.forget_secret()
+
+    # Row layout used by the storage backends: website, username, password, notes, timestamp, nonce
+    def to_row(self) -> list:
+        return [self.website, self.username, self.ciphertext, self.notes, self.timestamp, self.nonce]
+
+    # Keep the plaintext in memory for a short time if caching is enabled
+    def __cache_secret(self, secret: str) -> None:
+        if self.cache_ttl > 0:
+            self._secret = secret
+            self._secret_expires = time.monotonic() + self.cache_ttl
+            if self.cached is not None:
+                self.cached.add(self)
+
+# Repository that loads the vault once and serves every page from memory
+class VaultRepository:
+    def __init__(self, cipher, storage=None, cache_ttl: float = 30.0):
+        '''
+        cipher: PasswordCipher with the key generated from the master password
+        storage: Backend the records are saved to, defaults to the journal
+        cache_ttl: Seconds a decrypted password stays cached on its record (0 disables caching)
+        cached: Records that currently hold a decrypted password
+        records: Records of the vault keyed by their id
+        index: Search index over the website, username and notes of every record
+        by_website: Records sorted alphabetically (case and locale aware)
+        by_timestamp: Records sorted by last updated time
+        '''
+        self.cipher = cipher
+        self.storage = storage if storage is not None else JournalStorage()
+        self.cache_ttl = cache_ttl
+        self.cached = set()
+        self.records = {}
+        self.index = SearchIndex()
+        self.by_website = SortIndex(website_key)
+        self.by_timestamp = SortIndex(timestamp_key)
+        self.load()
+
+    # Read every record from storage. Only needs to be called once per session
+    # Passwords are not decrypted here, each record decrypts its own password when it is first read
+    def load(self) -> None:
+        self.forget_secrets()
+        self.records = {}
+        self.index = SearchIndex()
+        for record_id, row in self.storage.load():
+            record = self.__make_record(record_id, row[0], row[1], row[2], row[3], float(row[4]), row[5])
+            self.records[record.id] = record
+            self.index.add(record)
+        self.by_website.build(self.records.values()) # One sort per order at load, kept up to date after that
+        self.by_timestamp.build(self.records.values())
+
+    # @ret: Every record in the vault, in the order they were saved
+    def all(self) -> list:
+        self.expire_secrets()
+        return list(self.records.values())
+
+    # Records sorted for the password list
+    # order: 1 = alphabetical, 2 = reverse alphabetical, 3 = newest, 4 = oldest
+    # @ret: Sorted list of records
+    def ordered(self, order: int) -> list:
+        self.expire_secrets()
+        if order == 1:
+            ids = self.by_website.ids() # Alphabetical
+        elif order == 2:
+            ids = self.by_website.ids(reverse=True) # Reverse alphabetical
+        elif order == 3:
+            ids = self.by_timestamp.ids(reverse=True) # Newest
+        else:
+            ids = self.by_timestamp.ids() # Oldest
+        return [self.records[record_id] for record_id in ids]
+
+    # @ret: The record with the given id, or None if there isn't one
+    def get(self, record_id: str):
+        self.expire_secrets()
+        return self.records.get(record_id)
+
+    # Number of records in the vault
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # Encrypt and save a new password profile
+    # @ret: The new record
+    def insert(self, website: str, username: str, password: str, notes: str) -> PasswordRecord:
+        ciphertext, nonce = self.cipher.encrypt(password, username.encode('utf-8')) # Username is the authentication data
+        record = self.__make_record(new_record_id(), website, username, "", notes, time.time(), "")
+        record.set_encrypted(ciphertext.decode('utf-8'), nonce.decode('utf-8'))
+
+        self.storage.put(record.id, record.to_row())
+        self.records[record.id] = record
+        self.index.add(record)
+        self.by_website.add(record)
+        self.by_timestamp.add(record)
+        return record
+
+    # Re-encrypt and save an existing password profile
+    # @ret: The updated record
+    def update(self, record_id: str, website: str, username: str, password: str, notes: str) -> PasswordRecord:
+        record = self.records[record_id]
+        ciphertext, nonce = self.cipher.encrypt(password, username.encode('utf-8'))
+        record.website = website
+        record.username = username
+        record.set_encrypted(ciphertext.decode('utf-8'), nonce.decode('utf-8'))
+        record.notes = notes
+        record.timestamp = time.time()
+
+        # Edited records move to the end just like they used to
+        self.storage.put(record_id, record.to_row())
+        del self.records[record_id]
+        self.records[record_id] = record
+        self.index.add(record) # Replaces the old entry
+        self.by_website.add(record) # Moves the record if its key changed
+        self.by_timestamp.add(record)
+        return record
+
+    # Remove a password profile from the vault
+    def delete(self, record_id: str) -> None:
+        self.storage.delete(record_id)
+        self.records.pop(record_id).forget_secret()
+        self.index.remove(record_id)
+        self.by_website.remove(record_id)
+        self.by_timestamp.remove(record_id)
+
+    # Ids of the records whose website, username or notes contain the query
+    # @ret: Set of record ids, or None if the query is empty and everything matches
+    def search(self, query: str):
+        return self.index.search(query)
+
+    # Typo tolerant search
+    # @ret: Records that are close to the query, best match first
+    # cancelled: Optional function that returns True once the caller no longer wants the result
+    def fuzzy_search(self, query: str, limit: int = 50, cancelled=None) -> list:
+        records = (self.records.get(record_id) for record_id in self.index.fuzzy(query, limit, cancelled=cancelled))
+        return [record for record in records if record is not None] # Skip records deleted while searching
+
+    # Finish any pending storage work, e.g. a background compaction
+    def close(self) -> None:
+        self.storage.close()
+
+    # Decrypt many records at once using the cipher's bulk api, for whole-vault work like breach scans
+    # records: Records to decrypt, defaults to the whole vault
+    # stream: Yield passwords as they are decrypted instead of returning a list
+    # @ret: Decrypted passwords in the same order as records
+    def secrets(self, records: list = None, stream: bool = False):
+        if records is None:
+            records = self.all()
+        items = [(record.ciphertext, record.nonce, record.username.encode('utf-8')) for record in records] # Username is the authentication data
+        return self.cipher.decrypt_many(items, stream)
+
+    # Drop every cached plaintext password, e.g. when the window is hidden or the app quits
+    def forget_secrets(self) -> None:
+        for record in list(self.cached): # Copied, forgetting removes records from the set
+            record.forget_secret()
+
+    # Drop the cached plaintext passwords whose time is up. Runs on every read of the vault and from a timer in the main window
+    def expire_secrets(self) -> None:
+        now = time.monotonic()
+        for record in list(self.cached):
+            record.expire_secret(now)
+
+    # Create a record that decrypts with this vault's cipher
+    def __make_record(self, record_id, website, username, ciphertext, notes, timestamp, nonce) -> PasswordRecord:
+        return PasswordRecord(record_id, website, username, ciphertext, notes, timestamp, nonce, self.cipher, self.cache_ttl, self.cached)
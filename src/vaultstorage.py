@@ -0,0 +1,323 @@
+'''
+Artifact: Pic-a-Pass vaultstorage.py
+Description: Storage backends used by the vault repository to persist password records
+Author(s): Team
+Precondition(s): None
+Postcondition(s): None
+Error(s):
+- File save error: Cannot save to the vault file as it has writing issues.
+Side effect(s): Writes to the vault file. The journal may rewrite itself in a background thread
+Invariant(s): Replaying the journal always gives the records that were last saved
+Known fault(s): None
+
+#########################################################################################
+| Author       |  Date      | Revise Description                                        |
+#########################################################################################
+| Team         | 10/18/26   | Document created                                          |
+| Team         | 10/18/26   | SQLite backend with keyed saves and migration             |
+#########################################################################################
+'''
+import csv # Used for reading and writing rows
+import io # Used for formatting rows before they are written
+import os # Used for fsync and atomic replace
+import sqlite3 # Used for the SQLite backend
+import threading # Used for background compaction
+import uuid # Used for generating record ids
+
+'''
+Every backend stores rows keyed by record id. A row is the passwords.csv layout:
+website, username, password, notes, timestamp, nonce
+'''
+
+# Generates a new id for a record
+def new_record_id() -> str:
+    return uuid.uuid4().hex
+
+# The original passwords.csv format. Inserts are appends, updates and deletes rewrite the whole file
+class CSVStorage:
+    def __init__(self, path: str = "passwords.csv"):
+        '''
+        PATH: Path of the passwords file
+        rows: Rows of the file keyed by record id. The file has no ids so they only last for the session
+        '''
+        self.PATH = path
+        self.rows = {}
+
+    # @ret: (record id, row) for every saved record, in file order
+    def load(self) -> list:
+        self.rows = {}
+        try:
+            with open(self.PATH, mode='r', newline='') as file:
+                for row in csv.reader(file):
+                    if len(row) >= 6: # Skip blank or malformed lines
+                        self.rows[new_record_id()] = row[:6]
+        except FileNotFoundError: # No passwords have been saved yet
+            pass
+        return list(self.rows.items())
+
+    # Save a new or changed record
+    def put(self, record_id: str, row: list) -> None:
+        if record_id not in self.rows: # New records only need to be appended
+            self.rows[record_id] = row
+            with open(self.PATH, mode='a', newline='') as file:
+                csv.writer(file).writerow(row)
+            return
+        # Edited records move to the end of the file
+        del self.rows[record_id]
+        self.rows[record_id] = row
+        self.__write_all()
+
+    # Remove a record
+    def delete(self, record_id: str) -> None:
+        del self.rows[record_id]
+        self.__write_all()
+
+    def close(self) -> None:
+        pass
+
+    def __write_all(self) -> None:
+        with open(self.PATH, mode='w', newline='') as file:
+            csv.writer(file).writerows(self.rows.values())
+
+# Append-only log of put and delete entries. Every save is a single append
+# Log lines look like: put, id, website, username, password, notes, timestamp, nonce
+#                      del, id
+class JournalStorage:
+    def __init__(self, path: str = "passwords.log", legacy_path: str = "passwords.csv", dead_ratio: float = 0.5, min_compact: int = 64):
+        '''
+        PATH: Path of the journal
+        LEGACY_PATH: passwords.csv file that gets imported the first time the journal is created
+        DEAD_RATIO: Fraction of dead log lines that triggers a compaction
+        MIN_COMPACT: Don't bother compacting journals with fewer lines than this
+        rows: Live rows keyed by record id
+        '''
+        self.PATH = path
+        self.LEGACY_PATH = legacy_path
+        self.DEAD_RATIO = dead_ratio
+        self.MIN_COMPACT = min_compact
+        self.rows = {}
+        self._lines = 0 # Number of lines in the journal, live or dead
+        self._file = None # Journal opened for appending
+        self._lock = threading.Lock() # Guards the journal file and rows
+        self._compactor = None # Background compaction thread, if one is running
+        self._pending = None # Lines appended while a compaction is running
+
+    # Replay the journal into rows. Imports passwords.csv the first time
+    # @ret: (record id, row) for every live record, in the order they were last saved
+    def load(self) -> list:
+        with self._lock:
+            if not os.path.exists(self.PATH):
+                self.__import_legacy()
+            self.__repair_tail()
+            self.rows = {}
+            self._lines = 0
+            with open(self.PATH, mode='r', newline='') as file:
+                for entry in csv.reader(file):
+                    self._lines += 1
+                    if len(entry) >= 8 and entry[0] == "put":
+                        self.rows.pop(entry[1], None) # Re-saved records move to the end
+                        self.rows[entry[1]] = entry[2:8]
+                    elif len(entry) >= 2 and entry[0] == "del":
+                        self.rows.pop(entry[1], None)
+            self._file = open(self.PATH, mode='a', newline='')
+            rows = list(self.rows.items())
+        self.__maybe_compact()
+        return rows
+
+    # Save a new or changed record
+    def put(self, record_id: str, row: list) -> None:
+        with self._lock:
+            self.rows.pop(record_id, None)
+            self.rows[record_id] = row
+            self.__append(["put", record_id] + row)
+        self.__maybe_compact()
+
+    # Remove a record
+    def delete(self, record_id: str) -> None:
+        with self._lock:
+            del self.rows[record_id]
+            self.__append(["del", record_id])
+        self.__maybe_compact()
+
+    # Rewrite the journal so it only holds live records
+    # background: Do the rewrite on a worker thread
+    def compact(self, background: bool = False) -> None:
+        with self._lock:
+            if self._compactor is not None: # Already compacting
+                return
+            snapshot = [["put", record_id] + row for record_id, row in self.rows.items()]
+            self._pending = []
+            compactor = threading.Thread(target=self.__compact, args=(snapshot,), daemon=True)
+            self._compactor = compactor
+            compactor.start()
+        if not background:
+            compactor.join()
+
+    # Wait for any compaction and close the journal
+    def close(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # Write one log line and make sure it reached the disk
+    def __append(self, entry: list) -> None:
+        line = format_row(entry)
+        self._file.write(line)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._lines += 1
+        if self._pending is not None: # A compaction is running, it has to copy this line too
+            self._pending.append(line)
+
+    # Compact in the background once enough of the journal is dead lines
+    def __maybe_compact(self) -> None:
+        dead = self._lines - len(self.rows)
+        if self._lines >= self.MIN_COMPACT and dead >= self._lines * self.DEAD_RATIO:
+            self.compact(background=True)
+
+    # Worker for compact. Writes the snapshot to a temp file then swaps it in atomically
+    def __compact(self, snapshot: list) -> None:
+        tmp_path = self.PATH + ".tmp"
+        try:
+            with open(tmp_path, mode='w', newline='') as file:
+                file.writelines(format_row(entry) for entry in snapshot)
+                with self._lock: # Copy lines saved since the snapshot, then swap files while nobody can append
+                    file.writelines(self._pending)
+                    file.flush()
+                    os.fsync(file.fileno())
+                    self._file.close()
+                    try:
+                        os.replace(tmp_path, self.PATH)
+                        self._lines = len(snapshot) + len(self._pending)
+                    finally: # Whether or not the swap worked, later saves need an open journal (the old one if it failed)
+                        self._file = open(self.PATH, mode='a', newline='')
+        finally:
+            with self._lock:
+                self._pending = None
+                self._compactor = None
+            if os.path.exists(tmp_path): # Compaction failed part way, the old journal is still intact
+                os.remove(tmp_path)
+
+    # A crash in the middle of an append can leave a partial last line. Cut it off
+    def __repair_tail(self) -> None:
+        with open(self.PATH, mode='rb+') as file:
+            data = file.read()
+            if data and not data.endswith(b"\n"):
+                file.truncate(data.rfind(b"\n") + 1)
+
+    # Create the journal from an existing passwords.csv file
+    def __import_legacy(self) -> None:
+        tmp_path = self.PATH + ".tmp"
+        with open(tmp_path, mode='w', newline='') as file:
+            legacy = CSVStorage(self.LEGACY_PATH)
+            file.writelines(format_row(["put", record_id] + row) for record_id, row in legacy.load())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.PATH)
+
+# Local SQLite database. Saving a record is a keyed update instead of a file rewrite
+class SQLiteStorage:
+    def __init__(self, path: str = "passwords.db", legacy_path: str = "passwords.csv"):
+        '''
+        PATH: Path of the database
+        LEGACY_PATH: passwords.csv file that gets imported the first time the database is created
+        '''
+        self.PATH = path
+        self.LEGACY_PATH = legacy_path
+        self._db = None # Connection to the database
+        self._seq = 0 # Save counter, keeps records in the order they were last saved
+        self._lock = threading.Lock() # The connection is shared between threads
+
+    # Open the database, creating it from passwords.csv the first time
+    # @ret: (record id, row) for every saved record, in the order they were last saved
+    def load(self) -> list:
+        with self._lock:
+            if self._db is None:
+                new = not os.path.exists(self.PATH)
+                self._db = sqlite3.connect(self.PATH, check_same_thread=False)
+                create_sqlite_schema(self._db)
+                if new:
+                    copy_rows_to_sqlite(self._db, CSVStorage(self.LEGACY_PATH).load())
+            rows = self._db.execute(
+                "SELECT id, website, username, password, notes, timestamp, nonce, seq FROM records ORDER BY seq"
+            ).fetchall()
+        self._seq = rows[-1][7] if rows else 0
+        return [(row[0], list(row[1:7])) for row in rows]
+
+    # Save a new or changed record
+    def put(self, record_id: str, row: list) -> None:
+        with self._lock:
+            self._seq += 1
+            self._db.execute(
+                "INSERT INTO records (id, website, username, password, notes, timestamp, nonce, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET website=excluded.website, username=excluded.username, password=excluded.password, "
+                "notes=excluded.notes, timestamp=excluded.timestamp, nonce=excluded.nonce, seq=excluded.seq",
+                [record_id] + row[:4] + [float(row[4]), row[5], self._seq]
+            )
+            self._db.commit()
+
+    # Remove a record
+    def delete(self, record_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM records WHERE id = ?", (record_id,))
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+# Create the records table and its index if they don't exist. Saves are keyed by id and the password list sorts
+# in memory (see VaultRepository.ordered), so the load order is the only index
+def create_sqlite_schema(db) -> None:
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS records ("
+        "id TEXT PRIMARY KEY, website TEXT, username TEXT, password TEXT, notes TEXT, timestamp REAL, nonce TEXT, seq INTEGER)"
+    )
+    db.execute("CREATE INDEX IF NOT EXISTS records_seq ON records (seq)") # Load order
+    db.commit()
+
+# Bulk insert (record id, row) pairs into an empty database in one transaction
+def copy_rows_to_sqlite(db, rows: list) -> None:
+    db.executemany(
+        "INSERT INTO records (id, website, username, password, notes, timestamp, nonce, seq) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ([record_id] + row[:4] + [float(row[4]), row[5], seq] for seq, (record_id, row) in enumerate(rows, start=1))
+    )
+    db.commit()
+
+# One-shot migration of an existing passwords.csv file to a new SQLite database
+# @ret: Number of records migrated
+def migrate_csv_to_sqlite(csv_path: str = "passwords.csv", db_path: str = "passwords.db") -> int:
+    if os.path.exists(db_path):
+        raise FileExistsError(f"{db_path} already exists") # Never merge into an existing vault
+    rows = CSVStorage(csv_path).load()
+    tmp_path = db_path + ".tmp"
+    db = sqlite3.connect(tmp_path)
+    try:
+        create_sqlite_schema(db)
+        copy_rows_to_sqlite(db, rows)
+    finally:
+        db.close()
+    os.replace(tmp_path, db_path) # Only a complete database ever appears at db_path
+    return len(rows)
+
+# Create a storage backend by name: "journal" (default), "sqlite" or "csv"
+def open_storage(backend: str = "journal"):
+    if backend == "journal":
+        return JournalStorage()
+    if backend == "sqlite":
+        return SQLiteStorage()
+    if backend == "csv":
+        return CSVStorage()
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+# Format a row as a single csv line
+def format_row(row: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()